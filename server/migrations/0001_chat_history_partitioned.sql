@@ -0,0 +1,103 @@
+-- Monthly-partitioned copy of chat_history, kept in sync by a trigger while
+-- 0002 backfills it and 0003 swaps it in. Nothing here scans the live table.
+
+CREATE TABLE IF NOT EXISTS chat_history_p (
+  id UUID DEFAULT gen_random_uuid() NOT NULL,
+  user_email TEXT NOT NULL,
+  session_id TEXT NOT NULL,
+  role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
+  content TEXT NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Catches anything outside the monthly partitions (including legacy NULL created_at, stored as epoch)
+CREATE TABLE IF NOT EXISTS chat_history_default PARTITION OF chat_history_p DEFAULT;
+
+-- Creates chat_history_yYYYYmMM partitions from from_month through months_ahead past the current month.
+-- If the monthly run lapsed, that month's rows already sit in the default partition and
+-- PARTITION OF would fail its constraint check; they are moved into the new partition instead.
+CREATE OR REPLACE FUNCTION ensure_chat_history_partitions(parent regclass, from_month date, months_ahead int)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+  month_start date := date_trunc('month', from_month)::date;
+  month_end date;
+  last_month date := (date_trunc('month', NOW()) + make_interval(months => months_ahead))::date;
+  partition_name text;
+  default_partition regclass;
+  stranded boolean;
+BEGIN
+  SELECT NULLIF(partdefid, 0)::regclass INTO default_partition
+    FROM pg_partitioned_table WHERE partrelid = parent;
+
+  WHILE month_start <= last_month LOOP
+    month_end := (month_start + interval '1 month')::date;
+    partition_name := 'chat_history_' || to_char(month_start, '"y"YYYY"m"MM');
+
+    IF to_regclass(quote_ident(partition_name)) IS NULL THEN
+      stranded := false;
+      IF default_partition IS NOT NULL THEN
+        -- Block inserts routed to the default so none land between this check and the new partition
+        EXECUTE format('LOCK TABLE %s IN SHARE ROW EXCLUSIVE MODE', default_partition);
+        EXECUTE format('SELECT EXISTS (SELECT 1 FROM %s WHERE created_at >= %L AND created_at < %L)',
+                       default_partition, month_start, month_end)
+          INTO stranded;
+      END IF;
+
+      IF NOT stranded THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+                       partition_name, parent, month_start, month_end);
+      ELSE
+        RAISE NOTICE 'Moving % rows out of % into %', to_char(month_start, 'YYYY-MM'), default_partition, partition_name;
+        EXECUTE format('CREATE TABLE %I (LIKE %s INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name, parent);
+        EXECUTE format(
+          'WITH moved AS (DELETE FROM %s WHERE created_at >= %L AND created_at < %L RETURNING *) '
+          'INSERT INTO %I SELECT * FROM moved',
+          default_partition, month_start, month_end, partition_name);
+        EXECUTE format('ALTER TABLE %s ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                       parent, partition_name, month_start, month_end);
+      END IF;
+    END IF;
+    month_start := month_end;
+  END LOOP;
+END;
+$$;
+
+-- Current month onwards; 0002 adds the months the existing rows need before copying them
+SELECT ensure_chat_history_partitions('chat_history_p'::regclass, date_trunc('month', NOW())::date, 3);
+
+-- History pages: WHERE user_email, session_id ORDER BY created_at
+CREATE INDEX IF NOT EXISTS idx_chat_history_session_created
+  ON chat_history_p (user_email, session_id, created_at);
+
+-- Session list: WHERE user_email AND role = 'user' ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_chat_history_user_sessions
+  ON chat_history_p (user_email, created_at DESC) INCLUDE (session_id)
+  WHERE role = 'user';
+
+-- Mirror writes on the live table until the swap
+CREATE OR REPLACE FUNCTION chat_history_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO chat_history_p (id, user_email, session_id, role, content, created_at)
+    VALUES (NEW.id, NEW.user_email, NEW.session_id, NEW.role, NEW.content, COALESCE(NEW.created_at, 'epoch'))
+    ON CONFLICT DO NOTHING;
+  ELSIF TG_OP = 'UPDATE' THEN
+    UPDATE chat_history_p
+       SET user_email = NEW.user_email, session_id = NEW.session_id, role = NEW.role, content = NEW.content
+     WHERE id = OLD.id AND created_at = COALESCE(OLD.created_at, 'epoch');
+  ELSE
+    DELETE FROM chat_history_p WHERE id = OLD.id AND created_at = COALESCE(OLD.created_at, 'epoch');
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- CREATE TRIGGER takes a SHARE ROW EXCLUSIVE lock on the live table; give up rather than
+-- queue behind long transactions (and block every chat write queued behind us)
+SET LOCAL lock_timeout = '5s';
+
+DROP TRIGGER IF EXISTS chat_history_sync ON chat_history;
+CREATE TRIGGER chat_history_sync
+  AFTER INSERT OR UPDATE OR DELETE ON chat_history
+  FOR EACH ROW EXECUTE FUNCTION chat_history_sync();
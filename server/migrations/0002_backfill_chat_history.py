@@ -0,0 +1,59 @@
+"""Copy existing chat_history rows into chat_history_p without locking the live table.
+
+Rows are copied in keyset batches ordered by the primary key, each batch in
+its own short transaction. The batch's source rows are held FOR SHARE only
+while they are copied, so a concurrent rename/delete waits for one batch at
+most and is then mirrored by the chat_history_sync trigger from 0001.
+Safe to re-run: already-copied rows are skipped with ON CONFLICT DO NOTHING.
+"""
+
+import os
+import time
+
+BATCH_SIZE = int(os.environ.get("BACKFILL_BATCH_SIZE", "5000"))
+PAUSE_SECONDS = float(os.environ.get("BACKFILL_PAUSE_SECONDS", "0.05"))
+
+COPY_BATCH = """
+WITH batch AS (
+  SELECT id, user_email, session_id, role, content, COALESCE(created_at, 'epoch') AS created_at
+    FROM chat_history
+   WHERE id > %s
+   ORDER BY id
+   LIMIT %s
+     FOR SHARE
+), copied AS (
+  INSERT INTO chat_history_p (id, user_email, session_id, role, content, created_at)
+  SELECT * FROM batch
+  ON CONFLICT DO NOTHING
+)
+SELECT (SELECT count(*) FROM batch), (SELECT id FROM batch ORDER BY id DESC LIMIT 1)
+"""
+
+
+def up(conn):
+    # Partitions for the months the existing rows span (read-only scan, no write locks)
+    oldest = conn.execute("SELECT min(created_at) FROM chat_history").fetchone()[0]
+    if oldest is not None:
+        conn.execute(
+            "SELECT ensure_chat_history_partitions('chat_history_p'::regclass, %s::date, 3)",
+            (oldest,),
+        )
+
+    cursor = "00000000-0000-0000-0000-000000000000"
+    total = 0
+    started = time.monotonic()
+    while True:
+        count, last_id = conn.execute(COPY_BATCH, (cursor, BATCH_SIZE)).fetchone()
+        if not count:
+            break
+        total += count
+        cursor = last_id
+        print(f"  copied {total} rows ({total / max(time.monotonic() - started, 0.001):.0f}/s)")
+        time.sleep(PAUSE_SECONDS)
+
+    # One statement, one snapshot: trigger-mirrored inserts land in both tables or neither
+    source, target = conn.execute(
+        "SELECT (SELECT count(*) FROM chat_history), (SELECT count(*) FROM chat_history_p)"
+    ).fetchone()
+    if source != target:
+        raise RuntimeError(f"Backfill incomplete: chat_history has {source} rows, chat_history_p has {target}")
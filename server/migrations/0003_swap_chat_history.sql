@@ -0,0 +1,16 @@
+-- Swap the partitioned table in. Only renames happen under the exclusive lock,
+-- so it is held for milliseconds; give up rather than queue behind long readers.
+-- The old table is kept as chat_history_old for rollback; drop it in a later migration.
+
+SET LOCAL lock_timeout = '5s';
+
+LOCK TABLE chat_history IN ACCESS EXCLUSIVE MODE;
+
+DROP TRIGGER IF EXISTS chat_history_sync ON chat_history;
+DROP FUNCTION IF EXISTS chat_history_sync();
+
+ALTER TABLE chat_history RENAME TO chat_history_old;
+ALTER TABLE chat_history_p RENAME TO chat_history;
+
+-- Let PostgREST (Supabase API) pick up the new table
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,18 @@
+-- migrate:no-transaction
+-- Covering index for the daily usage lookups (WHERE email, date → counts),
+-- and removal of indexes that duplicate UNIQUE constraints.
+
+-- This file only re-runs after a failure, and a failed CONCURRENTLY build leaves
+-- an INVALID index that IF NOT EXISTS would skip. Rebuild from scratch; the
+-- UNIQUE(email, date) constraint keeps serving lookups meanwhile.
+DROP INDEX CONCURRENTLY IF EXISTS idx_usage_email_date_counts;
+
+CREATE UNIQUE INDEX CONCURRENTLY idx_usage_email_date_counts
+  ON usage (email, date) INCLUDE (id, chat_count, apply_count, resume_count, upload_count);
+
+-- Same columns as UNIQUE(email, date) and the covering index above
+DROP INDEX CONCURRENTLY IF EXISTS idx_usage_email_date;
+
+-- users.email and profiles.email are UNIQUE, which already creates these indexes
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_email;
+DROP INDEX CONCURRENTLY IF EXISTS idx_profiles_email;
@@ -0,0 +1,5 @@
+-- Action the LLM returned for each assistant turn; labels user turns for the
+-- fast-path intent router (npm run intent:train -- --from-logs).
+-- Nullable with no default, so this is a catalog-only change.
+
+ALTER TABLE chat_history ADD COLUMN IF NOT EXISTS action TEXT;
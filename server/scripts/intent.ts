@@ -0,0 +1,149 @@
+// Offline tooling for the fast-path intent router (src/services/intent.ts)
+//
+//   npm run intent:train [-- --from-logs] [--limit 20000]
+//       Trains on data/intents.jsonl (+ labelled chat_history turns) → data/intent-model.json
+//   npm run intent:eval [-- --from-logs] [--threshold 0.9]
+//       5-fold cross-validation: per-action precision/recall, misroutes, LLM calls saved
+//
+// chat_history turns are labelled by the action the LLM returned for them
+// (chat_history.action, migration 0005). Fast-path replies are stored without
+// an action, so the router never trains on its own output.
+
+import fs from "fs";
+import dotenv from "dotenv";
+import {
+    FAST_PATH_ACTIONS, FastPathAction, IntentLabel, LabeledExample,
+    SEED_PATH, MODEL_PATH, loadExamples, trainIntentModel, routeIntent,
+} from "../src/services/intent";
+import { getSupabase } from "../src/services/database";
+
+dotenv.config();
+
+function flag(name: string): string | undefined {
+    const i = process.argv.indexOf(`--${name}`);
+    if (i === -1) return undefined;
+    const value = process.argv[i + 1];
+    return value && !value.startsWith("--") ? value : "true";
+}
+
+async function loadLogExamples(limit: number): Promise<LabeledExample[]> {
+    const db = getSupabase();
+    const rows: Array<{ user_email: string; session_id: string; role: string; content: string; action: string | null }> = [];
+    const PAGE = 1000;
+    for (let from = 0; from < limit; from += PAGE) {
+        const { data, error } = await db
+            .from("chat_history")
+            .select("user_email, session_id, role, content, action")
+            .order("user_email")
+            .order("session_id")
+            .order("created_at")
+            .range(from, Math.min(from + PAGE, limit) - 1);
+        if (error) throw new Error(error.message);
+        rows.push(...(data || []));
+        if (!data || data.length < PAGE) break;
+    }
+
+    // A user turn is labelled by the action of the assistant turn that follows it
+    const examples: LabeledExample[] = [];
+    for (let i = 0; i + 1 < rows.length; i++) {
+        const user = rows[i];
+        const reply = rows[i + 1];
+        if (user.role !== "user" || reply.role !== "assistant" || !reply.action) continue;
+        if (user.session_id !== reply.session_id || user.user_email !== reply.user_email) continue;
+        if (user.content.includes("[Attached File Context]")) continue;
+        const label: IntentLabel = FAST_PATH_ACTIONS.includes(reply.action as FastPathAction)
+            ? reply.action as FastPathAction
+            : "OTHER";
+        examples.push({ text: user.content, label });
+    }
+    return examples;
+}
+
+async function loadDataset(): Promise<LabeledExample[]> {
+    const examples = loadExamples(SEED_PATH);
+    console.log(`Seeds: ${examples.length} examples`);
+    if (flag("from-logs")) {
+        const logs = await loadLogExamples(Number(flag("limit")) || 20000);
+        console.log(`chat_history: ${logs.length} labelled turns`);
+        examples.push(...logs);
+    }
+    return examples;
+}
+
+function evaluate(examples: LabeledExample[], threshold: number, folds = 5, verbose = true) {
+    // Deterministic shuffle so runs are comparable
+    const shuffled = examples
+        .map((e, i) => ({ e, k: (i * 2654435761) % 4294967296 }))
+        .sort((a, b) => a.k - b.k)
+        .map(({ e }) => e);
+
+    const stats = Object.fromEntries(
+        FAST_PATH_ACTIONS.map((a) => [a, { tp: 0, fp: 0, support: 0 }]),
+    ) as Record<FastPathAction, { tp: number; fp: number; support: number }>;
+    const misroutes: string[] = [];
+    let fastPathed = 0;
+
+    for (let fold = 0; fold < folds; fold++) {
+        const test = shuffled.filter((_, i) => i % folds === fold);
+        const model = trainIntentModel(shuffled.filter((_, i) => i % folds !== fold));
+        for (const { text, label } of test) {
+            if (label !== "OTHER") stats[label].support++;
+            const routed = routeIntent(model, text, threshold);
+            if (!routed) continue;
+            const { action: predicted, confidence } = routed;
+            fastPathed++;
+            if (predicted === label) stats[predicted].tp++;
+            else {
+                stats[predicted].fp++;
+                misroutes.push(`  "${text}" → ${predicted} (${confidence.toFixed(3)}), expected ${label}`);
+            }
+        }
+    }
+
+    if (verbose) {
+        console.log(`\nThreshold ${threshold} — ${folds}-fold cross-validation on ${examples.length} examples\n`);
+        console.log("  action              precision  recall  support");
+        for (const action of FAST_PATH_ACTIONS) {
+            const { tp, fp, support } = stats[action];
+            const precision = tp + fp ? (tp / (tp + fp)).toFixed(3) : "  -  ";
+            const recall = support ? (tp / support).toFixed(3) : "  -  ";
+            console.log(`  ${action.padEnd(18)}  ${precision.padStart(9)}  ${recall.padStart(6)}  ${String(support).padStart(7)}`);
+        }
+        console.log(`\n  LLM calls avoided: ${fastPathed}/${examples.length} (${((fastPathed / examples.length) * 100).toFixed(1)}%)`);
+        console.log(`  Misroutes: ${misroutes.length}`);
+        if (misroutes.length) console.log(misroutes.join("\n"));
+    }
+    return { fastPathed, misroutes: misroutes.length };
+}
+
+async function main() {
+    const command = process.argv[2];
+    const examples = await loadDataset();
+
+    if (command === "train") {
+        const model = trainIntentModel(examples);
+        fs.writeFileSync(MODEL_PATH, JSON.stringify(model));
+        console.log(`Wrote ${MODEL_PATH}`);
+        return;
+    }
+
+    if (command === "eval") {
+        const threshold = Number(flag("threshold")) || Number(process.env.INTENT_THRESHOLD) || 0.9;
+        evaluate(examples, threshold);
+
+        console.log("\n  Threshold sweep    avoided  misroutes");
+        for (const t of [0.6, 0.7, 0.8, 0.9, 0.95, 0.99]) {
+            const { fastPathed, misroutes } = evaluate(examples, t, 5, false);
+            console.log(`  ${t.toFixed(2).padEnd(17)}  ${String(fastPathed).padStart(7)}  ${String(misroutes).padStart(9)}`);
+        }
+        return;
+    }
+
+    console.error("Usage: tsx scripts/intent.ts <train|eval> [--from-logs] [--limit N] [--threshold T]");
+    process.exit(1);
+}
+
+main().catch((err) => {
+    console.error(err);
+    process.exit(1);
+});
@@ -0,0 +1,96 @@
+import cluster, { Worker } from "cluster";
+import os from "os";
+import { MemoryStore, serveClusterStore } from "./services/store";
+
+// Multi-core entry point: `node dist/cluster.js`
+// WEB_CONCURRENCY   → number of workers (default: one per core)
+// SIGHUP / SIGUSR2  → zero-downtime rolling restart
+// SIGTERM / SIGINT  → drain all workers and exit
+
+const WORKERS = Number(process.env.WEB_CONCURRENCY) || os.availableParallelism();
+const DRAIN_TIMEOUT_MS = 30 * 1000;
+const EARLY_EXIT_MS = 10 * 1000;      // a worker dying this soon after forking counts as a boot failure
+const MAX_EARLY_EXITS = 5;            // consecutive boot failures before the primary gives up
+const MAX_RESTART_DELAY_MS = 30 * 1000;
+
+if (cluster.isPrimary) {
+    // Single-host shared state when no STORE_URL is configured
+    const store = new MemoryStore();
+    let restarting = false;
+    let shuttingDown = false;
+    let earlyExits = 0;
+    const startedAt = new Map<Worker, number>();
+
+    const fork = (): Worker => {
+        const worker = cluster.fork();
+        startedAt.set(worker, Date.now());
+        serveClusterStore(worker, store);
+        return worker;
+    };
+
+    // Disconnect lets in-flight requests finish; kill if it takes too long
+    const drain = (worker: Worker): Promise<void> =>
+        new Promise((resolve) => {
+            const timer = setTimeout(() => worker.process.kill("SIGKILL"), DRAIN_TIMEOUT_MS);
+            worker.once("exit", () => {
+                clearTimeout(timer);
+                resolve();
+            });
+            worker.disconnect();
+        });
+
+    // Replace workers one at a time; the old one drains only after its replacement is listening
+    const rollingRestart = async () => {
+        if (restarting || shuttingDown) return;
+        restarting = true;
+        console.log(`🔄 Rolling restart of ${Object.keys(cluster.workers || {}).length} workers`);
+        for (const old of Object.values(cluster.workers || {})) {
+            if (!old) continue;
+            const replacement = fork();
+            await new Promise<void>((resolve) => {
+                replacement.once("listening", () => resolve());
+                replacement.once("exit", () => resolve());
+            });
+            await drain(old);
+        }
+        restarting = false;
+        console.log("✅ Rolling restart complete");
+    };
+
+    const shutdown = async (exitCode = 0) => {
+        if (shuttingDown) return;
+        shuttingDown = true;
+        await Promise.all(Object.values(cluster.workers || {}).map((w) => (w ? drain(w) : undefined)));
+        process.exit(exitCode);
+    };
+
+    // Re-fork crashed workers with exponential backoff; a worker that can't boot
+    // (port in use, bad env, throw at import) would otherwise fork in a tight loop
+    cluster.on("exit", (worker, code, signal) => {
+        const lived = Date.now() - (startedAt.get(worker) ?? 0);
+        startedAt.delete(worker);
+        if (worker.exitedAfterDisconnect || shuttingDown) return;
+
+        earlyExits = lived < EARLY_EXIT_MS ? earlyExits + 1 : 0;
+        if (earlyExits >= MAX_EARLY_EXITS) {
+            console.error(`❌ ${earlyExits} workers in a row died within ${EARLY_EXIT_MS / 1000}s of starting — stopping`);
+            shutdown(1);
+            return;
+        }
+        const delay = earlyExits ? Math.min(1000 * 2 ** (earlyExits - 1), MAX_RESTART_DELAY_MS) : 0;
+        console.error(`⚠️ Worker ${worker.process.pid} died (${signal || code}), restarting in ${delay} ms`);
+        setTimeout(() => {
+            if (!shuttingDown) fork();
+        }, delay);
+    });
+
+    process.on("SIGHUP", rollingRestart);
+    process.on("SIGUSR2", rollingRestart);
+    process.on("SIGTERM", () => shutdown());
+    process.on("SIGINT", () => shutdown());
+
+    console.log(`🧵 HireKit cluster primary ${process.pid} — starting ${WORKERS} workers`);
+    for (let i = 0; i < WORKERS; i++) fork();
+} else {
+    require("./index");
+}
@@ -1,28 +1,15 @@
+import { markListening, reportStartupProfile } from "./services/startup"; // first: times the imports below
 import express from "express";
 import cors from "cors";
 import dotenv from "dotenv";
-import rateLimit from "express-rate-limit";
-import { chatRouter } from "./routes/chat";
-import { uploadRouter } from "./routes/upload";
-import { jobsRouter } from "./routes/jobs";
-import { resumeRouter } from "./routes/resume";
-import { authRouter } from "./routes/auth";
-import { applyRouter } from "./routes/apply";
-import { profileRouter } from "./routes/profile";
-import { subscriptionRouter } from "./routes/subscription";
+import { rateLimiter } from "./services/ratelimit";
+import { lazyRouter, prewarm, readiness } from "./services/warmup";
 
 dotenv.config();
 
 const app = express();
 const PORT = process.env.PORT || 4000;
 
-// Rate limiting — prevent abuse
-const limiter = rateLimit({
-    windowMs: 1 * 60 * 1000,
-    max: 30,
-    message: { error: "Too many requests, slow down." },
-});
-
 // Middleware
 app.set("trust proxy", 1); // Render runs behind a proxy
 app.use(cors({
@@ -33,25 +20,29 @@ app.use(cors({
     ],
     credentials: true,
 }));
-app.use(express.json({ limit: "10mb" }));
-app.use(limiter);
+app.use(express.json({ limit: "1mb" })); // chat history is server-side; files go through /api/upload
+app.use(rateLimiter); // per user + plan tier, shared across workers
 
+// Routers are required on first request or by prewarm after listen, not at boot
 // Public routes
-app.use("/api/auth", authRouter);
-app.use("/api/subscription", subscriptionRouter);
+app.use("/api/auth", lazyRouter(() => require("./routes/auth").authRouter));
+app.use("/api/subscription", lazyRouter(() => require("./routes/subscription").subscriptionRouter));
 
 // Core routes
-app.use("/api/chat", chatRouter);
-app.use("/api/upload", uploadRouter);
-app.use("/api/jobs", jobsRouter);
-app.use("/api/resume", resumeRouter);
-app.use("/api/apply", applyRouter);
-app.use("/api/profile", profileRouter);
+app.use("/api/chat", lazyRouter(() => require("./routes/chat").chatRouter));
+app.use("/api/upload", lazyRouter(() => require("./routes/upload").uploadRouter));
+app.use("/api/jobs", lazyRouter(() => require("./routes/jobs").jobsRouter));
+app.use("/api/resume", lazyRouter(() => require("./routes/resume").resumeRouter));
+app.use("/api/apply", lazyRouter(() => require("./routes/apply").applyRouter));
+app.use("/api/profile", lazyRouter(() => require("./routes/profile").profileRouter));
 
-// Health check
-app.get("/api/health", (_req, res) => {
-    res.json({
+// Health check — always 200 for liveness; ?ready=1 returns 503 until prewarm has finished
+app.get("/api/health", (req, res) => {
+    const { ready, subsystems } = readiness();
+    res.status(req.query.ready && !ready ? 503 : 200).json({
         status: "ok",
+        ready,
+        subsystems,
         timestamp: new Date().toISOString(),
         routes: [
             "POST /api/auth/callback",
@@ -63,7 +54,9 @@ app.get("/api/health", (_req, res) => {
             "POST /api/resume/score",
             "POST /api/apply",
             "GET  /api/apply/track?email=",
-            "GET  /api/profile?email=",
+            "GET  /api/profile?email=&limit=",
+            "GET  /api/profile/applications?email=&before=&limit=",
+            "GET  /api/profile/resumes/:id?email=",
             "POST /api/profile",
             "GET  /api/subscription",
             "POST /api/subscription/upgrade",
@@ -72,8 +65,8 @@ app.get("/api/health", (_req, res) => {
     });
 });
 
-app.listen(PORT, () => {
-    console.log(`\n🚀 HireKit Server — Port ${PORT}\n`);
+const server = app.listen(PORT, () => {
+    console.log(`\n🚀 HireKit Server — Port ${PORT} (pid ${process.pid})\n`);
     console.log(`   GET  /api/health          → Status check`);
     console.log(`   POST /api/auth/callback   → Google OAuth`);
     console.log(`   POST /api/chat            → AI chat`);
@@ -85,4 +78,13 @@ app.listen(PORT, () => {
     console.log(`   GET  /api/apply/track     → Application tracker`);
     console.log(`   GET  /api/subscription    → Plan + usage`);
     console.log(`   GET  /api/subscription/plans → Available plans\n`);
+
+    markListening();
+    prewarm().then(() => reportStartupProfile("deferred"));
+});
+
+// Graceful shutdown — stop accepting, let in-flight requests finish
+process.on("SIGTERM", () => {
+    server.close(() => process.exit(0));
+    setTimeout(() => process.exit(1), 10 * 1000).unref();
 });
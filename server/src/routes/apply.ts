@@ -1,5 +1,4 @@
 import { Router } from "express";
-import { autoApply } from "../services/autoapply";
 import { getApplications, updateApplicationStatus } from "../services/database";
 
 export const applyRouter = Router();
@@ -15,6 +14,7 @@ applyRouter.post("/", async (req, res) => {
             });
         }
 
+        const { autoApply } = await import("../services/autoapply"); // loads puppeteer-core on first use
         const result = await autoApply({
             jobUrl,
             jobTitle,
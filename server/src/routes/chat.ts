@@ -2,19 +2,31 @@ import { Router } from "express";
 import { callGemini, generateResume, scoreResume, generateCoverLetter, interviewCoach, GeminiResponse } from "../services/gemini";
 import { checkUsage, incrementUsage, getUserPlan, getUsageSummary } from "../services/subscription";
 import { getProfile, upsertProfile, getApplications, saveChatMessage, saveResume } from "../services/database";
-import { autoApply } from "../services/autoapply";
+import { identifyUser } from "../services/auth";
+import { getConversation, appendConversation, dropConversation } from "../services/conversation";
+import { matchIntent } from "../services/intent";
 
 export const chatRouter = Router();
 
+const HISTORY_TAIL = 20; // matches the server-side buffer in services/conversation.ts
+
 // POST /api/chat
 chatRouter.post("/", async (req, res) => {
     try {
-        const { message, history, email, sessionId } = req.body;
+        const { message, email, sessionId } = req.body;
 
         if (!message) {
             return res.status(400).json({ error: "Message required" });
         }
 
+        // --- History is server-owned for signed-in sessions ---
+        // With a valid token clients send only the new message. Without one (anonymous, or the
+        // Google ID token has expired) the client sends a bounded tail as `history`
+        const owner = sessionId ? (await identifyUser(req))?.email : undefined;
+        const history = owner
+            ? await getConversation(owner, sessionId)
+            : (Array.isArray(req.body.history) ? req.body.history.slice(-HISTORY_TAIL) : []);
+
         // --- Usage check ---
         if (email) {
             const usage = await checkUsage(email, "chat");
@@ -27,26 +39,38 @@ chatRouter.post("/", async (req, res) => {
             }
         }
 
-        // --- Build context ---
-        const profile = email ? await getProfile(email) : null;
-        const plan = email ? await getUserPlan(email) : "free";
+        // --- Fast path: DB-only intents are dispatched without the LLM ---
+        const intent = matchIntent(message);
+        let profile: Awaited<ReturnType<typeof getProfile>> | null = null;
+        let aiResponse: GeminiResponse;
 
-        let chatsRemaining = 5;
-        let appliesRemaining = 0;
-        if (email) {
-            const chatUsage = await checkUsage(email, "chat");
-            const applyUsage = await checkUsage(email, "apply");
-            chatsRemaining = chatUsage.remaining;
-            appliesRemaining = applyUsage.remaining;
-        }
+        if (intent) {
+            aiResponse = { message: intent.reply, action: intent.action, data: {} };
+        } else {
+            // --- Build context ---
+            profile = email ? await getProfile(email) : null;
+            const plan = email ? await getUserPlan(email) : "free";
 
-        // --- Call Gemini ---
-        const aiResponse: GeminiResponse = await callGemini(
-            message,
-            history || [],
-            { profile, plan, chatsRemaining, appliesRemaining },
-        );
+            let chatsRemaining = 5;
+            let appliesRemaining = 0;
+            if (email) {
+                const chatUsage = await checkUsage(email, "chat");
+                const applyUsage = await checkUsage(email, "apply");
+                chatsRemaining = chatUsage.remaining;
+                appliesRemaining = applyUsage.remaining;
+            }
+
+            // --- Call Gemini ---
+            aiResponse = await callGemini(
+                message,
+                history,
+                { profile, plan, chatsRemaining, appliesRemaining },
+            );
+        }
 
+        // The handlers below may rewrite the action (e.g. AUTO_APPLY over quota → SHOW_PLAN);
+        // intent training needs what the LLM actually chose
+        const llmAction = intent ? undefined : aiResponse.action;
         let result: unknown = null;
 
         // --- Handle actions ---
@@ -154,6 +178,7 @@ chatRouter.post("/", async (req, res) => {
 
                 const data = aiResponse.data as { job_url?: string };
                 if (data.job_url && profile) {
+                    const { autoApply } = await import("../services/autoapply"); // loads puppeteer-core on first use
                     const applyResult = await autoApply({
                         jobUrl: data.job_url,
                         jobTitle: (profile.target_role as string) || "",
@@ -226,11 +251,18 @@ chatRouter.post("/", async (req, res) => {
         }
 
         // --- Track usage ---
+        if (owner) {
+            await appendConversation(owner, sessionId, [
+                { role: "user", content: message },
+                { role: "assistant", content: aiResponse.message },
+            ]);
+        }
         if (email) {
             await incrementUsage(email, "chat");
             if (sessionId) {
                 await saveChatMessage(email, "user", message, sessionId);
-                await saveChatMessage(email, "assistant", aiResponse.message, sessionId);
+                // The LLM's action labels the turn for intent training; fast-path replies stay unlabelled
+                await saveChatMessage(email, "assistant", aiResponse.message, sessionId, llmAction);
             }
         }
 
@@ -250,7 +282,7 @@ chatRouter.post("/", async (req, res) => {
 });
 
 import { authMiddleware } from "../services/auth";
-import { getChatSessions, getChatHistory, deleteChatSession, renameChatSession } from "../services/database";
+import { getChatSessions, getChatHistoryPage, deleteChatSession, renameChatSession } from "../services/database";
 
 // GET /api/chat/sessions
 chatRouter.get("/sessions", authMiddleware, async (req, res) => {
@@ -263,13 +295,15 @@ chatRouter.get("/sessions", authMiddleware, async (req, res) => {
     }
 });
 
-// GET /api/chat/history/:sessionId
+// GET /api/chat/history/:sessionId?before=&limit= — newest page first, cursor-paginated
 chatRouter.get("/history/:sessionId", authMiddleware, async (req, res) => {
     try {
         const user = (req as any).user;
         const { sessionId } = req.params;
-        const history = await getChatHistory(user.email, sessionId, 100);
-        res.json({ history });
+        const before = req.query.before as string | undefined;
+        const limit = Math.min(Number(req.query.limit) || 30, 100);
+        const page = await getChatHistoryPage(user.email, sessionId, { before, limit });
+        res.json(page);
     } catch (err) {
         res.status(500).json({ error: (err as Error).message });
     }
@@ -281,6 +315,7 @@ chatRouter.delete("/history/:sessionId", authMiddleware, async (req, res) => {
         const user = (req as any).user;
         const { sessionId } = req.params;
         await deleteChatSession(user.email, sessionId);
+        await dropConversation(user.email, sessionId);
         res.json({ success: true });
     } catch (err) {
         res.status(500).json({ error: (err as Error).message });
@@ -295,6 +330,7 @@ chatRouter.put("/rename", authMiddleware, async (req, res) => {
         if (!sessionId || !title) return res.status(400).json({ error: "Missing sessionId or title" });
         
         await renameChatSession(user.email, sessionId, title);
+        await dropConversation(user.email, sessionId);
         res.json({ success: true });
     } catch (err) {
         res.status(500).json({ error: (err as Error).message });
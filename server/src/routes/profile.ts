@@ -1,30 +1,50 @@
 import { Router } from "express";
-import { getProfile, upsertProfile } from "../services/database";
+import crypto from "crypto";
+import { getProfile, upsertProfile, PROFILE_SUMMARY_COLUMNS } from "../services/database";
 import { checkUsage, getUserPlan } from "../services/subscription";
-import { getApplications, getResumes } from "../services/database";
+import { getApplicationsPage, getResumes, getResume, RESUME_SUMMARY_COLUMNS } from "../services/database";
 
 export const profileRouter = Router();
 
-// GET /api/profile
+// GET /api/profile?email=&limit=&fields=summary|full
+// Summaries by default (no resume bodies) and the first page of applications;
+// later pages come from /applications. Responds 304 when If-None-Match matches the profile's version.
 profileRouter.get("/", async (req, res) => {
     try {
         const email = req.query.email as string;
         if (!email) return res.status(400).json({ error: "Email required" });
 
-        const profile = await getProfile(email);
-        const resumes = await getResumes(email);
-        const applications = await getApplications(email);
-        const plan = await getUserPlan(email);
-        
-        let chatsUsage = { allowed: true, limit: 10, remaining: 10 };
-        try {
-           chatsUsage = await checkUsage(email, "chat");
-        } catch(e){}
+        const full = req.query.fields === "full";
+        const limit = Math.min(Number(req.query.limit) || 20, 100);
+
+        const [profile, resumes, applicationsPage, plan, chatsUsage] = await Promise.all([
+            getProfile(email, full ? "*" : PROFILE_SUMMARY_COLUMNS),
+            getResumes(email, full ? "*" : RESUME_SUMMARY_COLUMNS),
+            getApplicationsPage(email, { limit }),
+            getUserPlan(email),
+            checkUsage(email, "chat").catch(() => ({ allowed: true, limit: 10, remaining: 10 })),
+        ]);
+
+        // Version = profile.updated_at plus the markers of everything else in the response
+        const version = JSON.stringify([
+            full, limit,
+            profile?.updated_at,
+            resumes.map((r) => r.id),
+            applicationsPage.applications.map((a) => [a.id, a.status]),
+            applicationsPage.total,
+            plan, chatsUsage.remaining, chatsUsage.limit,
+        ]);
+        const etag = `"${crypto.createHash("sha1").update(version).digest("base64url")}"`;
+        res.set("ETag", etag);
+        res.set("Cache-Control", "private, no-cache");
+        if (req.headers["if-none-match"] === etag) return res.status(304).end();
 
         res.json({
             profile: profile || null,
             resumes,
-            applications,
+            applications: applicationsPage.applications,
+            applicationsCursor: applicationsPage.nextCursor,
+            applicationsTotal: applicationsPage.total,
             usage: { plan, chatsUsed: chatsUsage.limit - chatsUsage.remaining, chatsLimit: chatsUsage.limit },
         });
     } catch (err) {
@@ -32,6 +52,36 @@ profileRouter.get("/", async (req, res) => {
     }
 });
 
+// GET /api/profile/applications?email=&before=&limit= — next page of applications only
+profileRouter.get("/applications", async (req, res) => {
+    try {
+        const email = req.query.email as string;
+        const before = req.query.before as string | undefined;
+        if (!email || !before) return res.status(400).json({ error: "Email and before required" });
+
+        const limit = Math.min(Number(req.query.limit) || 20, 100);
+        const page = await getApplicationsPage(email, { before, limit });
+        res.json({ applications: page.applications, applicationsCursor: page.nextCursor });
+    } catch (err) {
+        res.status(500).json({ error: (err as Error).message });
+    }
+});
+
+// GET /api/profile/resumes/:id?email= — full resume body
+profileRouter.get("/resumes/:id", async (req, res) => {
+    try {
+        const email = req.query.email as string;
+        if (!email) return res.status(400).json({ error: "Email required" });
+
+        const resume = await getResume(email, req.params.id);
+        if (!resume) return res.status(404).json({ error: "Resume not found" });
+        res.set("Cache-Control", "private, max-age=3600"); // resumes are immutable once saved
+        res.json({ resume });
+    } catch (err) {
+        res.status(500).json({ error: (err as Error).message });
+    }
+});
+
 // POST /api/profile
 profileRouter.post("/", async (req, res) => {
     try {
@@ -1,17 +1,23 @@
 import { Router } from "express";
-import Razorpay from "razorpay";
+import type Razorpay from "razorpay";
 import crypto from "crypto";
 import { authMiddleware } from "../services/auth";
-import { getUsageSummary } from "../services/subscription";
+import { getUsageSummary, invalidateUserPlan } from "../services/subscription";
 import { getSupabase } from "../services/database";
 
 export const subscriptionRouter = Router();
 
+let razorpay: Razorpay | null = null;
+
 function getRazorpay(): Razorpay {
-    const key_id = process.env.RAZORPAY_KEY_ID;
-    const key_secret = process.env.RAZORPAY_KEY_SECRET;
-    if (!key_id || !key_secret) throw new Error("Razorpay credentials not set in env");
-    return new Razorpay({ key_id, key_secret });
+    if (!razorpay) {
+        const key_id = process.env.RAZORPAY_KEY_ID;
+        const key_secret = process.env.RAZORPAY_KEY_SECRET;
+        if (!key_id || !key_secret) throw new Error("Razorpay credentials not set in env");
+        const RazorpayClient: typeof Razorpay = require("razorpay"); // loaded on first checkout, not at boot
+        razorpay = new RazorpayClient({ key_id, key_secret });
+    }
+    return razorpay;
 }
 
 const PLAN_PRICES: Record<string, { amount: number; name: string }> = {
@@ -103,6 +109,7 @@ subscriptionRouter.post("/webhook", async (req, res) => {
                         current_period_end: periodEnd.toISOString(),
                     })
                     .eq("email", email);
+                await invalidateUserPlan(email);
             }
         }
 
@@ -124,6 +131,7 @@ subscriptionRouter.post("/upgrade", authMiddleware, async (req, res) => {
 
         const db = getSupabase();
         await db.from("subscriptions").update({ plan, status: "active" }).eq("email", email);
+        await invalidateUserPlan(email);
 
         res.json({ message: `Upgraded to ${plan}!` });
     } catch (err) {
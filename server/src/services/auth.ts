@@ -1,8 +1,70 @@
 import { Request, Response, NextFunction } from "express";
-import { OAuth2Client } from "google-auth-library";
+import type { OAuth2Client } from "google-auth-library";
+import crypto from "crypto";
+import { getStore } from "./store";
 
-const GOOGLE_CLIENT_ID = process.env.GOOGLE_CLIENT_ID!;
-const googleClient = new OAuth2Client(GOOGLE_CLIENT_ID);
+let googleClient: OAuth2Client | null = null;
+
+// google-auth-library is loaded on first verification (or by prewarm), not at boot
+function getGoogleClient(): OAuth2Client {
+    if (!googleClient) {
+        const { OAuth2Client: Client } = require("google-auth-library") as typeof import("google-auth-library");
+        googleClient = new Client(process.env.GOOGLE_CLIENT_ID);
+    }
+    return googleClient;
+}
+
+// Fetch Google's signing certs so the first sign-in doesn't wait on them
+export async function warmGoogleCerts(): Promise<void> {
+    await getGoogleClient().getFederatedSignonCertsAsync();
+}
+
+// Verified tokens are cached so the rate limiter and the route don't both verify
+const TOKEN_CACHE_MS = 5 * 60 * 1000;
+
+export interface AuthUser {
+    googleId: string;
+    email: string;
+    name: string;
+    avatar: string;
+}
+
+export async function verifyToken(idToken: string): Promise<AuthUser> {
+    const store = getStore();
+    const cacheKey = `auth:${crypto.createHash("sha256").update(idToken).digest("hex")}`;
+    const hit = await store.get(cacheKey).catch(() => null);
+    if (hit) return JSON.parse(hit) as AuthUser;
+
+    const ticket = await getGoogleClient().verifyIdToken({
+        idToken,
+        audience: process.env.GOOGLE_CLIENT_ID!,
+    });
+
+    const payload = ticket.getPayload();
+    if (!payload) throw new Error("Invalid token");
+
+    const user: AuthUser = {
+        googleId: payload.sub,
+        email: payload.email!,
+        name: payload.name || payload.email!,
+        avatar: payload.picture || "",
+    };
+
+    const ttl = Math.min(TOKEN_CACHE_MS, payload.exp * 1000 - Date.now());
+    if (ttl > 0) store.set(cacheKey, JSON.stringify(user), ttl).catch(() => {});
+    return user;
+}
+
+// Resolve the signed-in user without rejecting the request
+export async function identifyUser(req: Request): Promise<AuthUser | null> {
+    const header = req.headers.authorization;
+    if (!header || !header.startsWith("Bearer ")) return null;
+    try {
+        return await verifyToken(header.split(" ")[1]);
+    } catch {
+        return null;
+    }
+}
 
 // Verify Google token on every request
 export async function authMiddleware(req: Request, res: Response, next: NextFunction) {
@@ -12,22 +74,7 @@ export async function authMiddleware(req: Request, res: Response, next: NextFunc
     }
 
     try {
-        const idToken = header.split(" ")[1];
-        const ticket = await googleClient.verifyIdToken({
-            idToken,
-            audience: GOOGLE_CLIENT_ID,
-        });
-
-        const payload = ticket.getPayload();
-        if (!payload) throw new Error("Invalid token");
-
-        (req as any).user = {
-            googleId: payload.sub,
-            email: payload.email!,
-            name: payload.name || payload.email!,
-            avatar: payload.picture || "",
-        };
-
+        (req as any).user = await verifyToken(header.split(" ")[1]);
         next();
     } catch {
         return res.status(401).json({ error: "Invalid Google token" });
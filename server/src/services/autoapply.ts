@@ -1,5 +1,6 @@
 import puppeteer, { Browser } from "puppeteer-core";
 import { saveApplication } from "./database";
+import { markWarm } from "./warmup";
 
 let browser: Browser | null = null;
 
@@ -21,10 +22,16 @@ async function getBrowser(): Promise<Browser> {
             executablePath: process.env.CHROME_PATH || getChromePath(),
             args: ["--no-sandbox", "--disable-setuid-sandbox", "--disable-dev-shm-usage"],
         });
+        markWarm("browser");
     }
     return browser;
 }
 
+// Launch Chrome ahead of the first auto-apply (prewarm with PREWARM_BROWSER=1)
+export async function warmBrowser(): Promise<void> {
+    await getBrowser();
+}
+
 export interface ApplyInput {
     jobUrl: string;
     jobTitle: string;
@@ -0,0 +1,41 @@
+import { getStore } from "./store";
+import { getChatHistoryPage } from "./database";
+import type { Message } from "./gemini";
+
+// Server-owned conversation state. Clients send only the new message; the
+// last HISTORY_TURNS messages per session live in the shared store and are
+// rebuilt from chat_history on a miss (new worker, restart, expired session).
+const HISTORY_TURNS = 20; // matches what callGemini sends to the model
+const CONVERSATION_TTL_MS = 30 * 60 * 1000;
+
+function conversationKey(email: string, sessionId: string) {
+    return `conv:${email}:${sessionId}`;
+}
+
+export async function getConversation(email: string, sessionId: string): Promise<Message[]> {
+    const store = getStore();
+    const key = conversationKey(email, sessionId);
+    const hit = await store.get(key).catch(() => null);
+    if (hit) return JSON.parse(hit) as Message[];
+
+    const { history } = await getChatHistoryPage(email, sessionId, { limit: HISTORY_TURNS });
+    const messages = history.map((row) => ({ role: row.role as string, content: row.content as string }));
+    store.set(key, JSON.stringify(messages), CONVERSATION_TTL_MS).catch(() => {});
+    return messages;
+}
+
+// Append a turn, keeping only the newest HISTORY_TURNS messages (ring buffer).
+// Best-effort: chat_history is the source of truth, so a failed write only costs a rebuild
+export async function appendConversation(email: string, sessionId: string, turn: Message[]) {
+    try {
+        const current = await getConversation(email, sessionId);
+        const next = [...current, ...turn].slice(-HISTORY_TURNS);
+        await getStore().set(conversationKey(email, sessionId), JSON.stringify(next), CONVERSATION_TTL_MS);
+    } catch {
+        await dropConversation(email, sessionId); // don't leave a buffer that's missing this turn
+    }
+}
+
+export async function dropConversation(email: string, sessionId: string) {
+    await getStore().del(conversationKey(email, sessionId)).catch(() => {});
+}
@@ -1,4 +1,4 @@
-import { createClient, SupabaseClient } from "@supabase/supabase-js";
+import type { SupabaseClient } from "@supabase/supabase-js";
 
 let supabase: SupabaseClient | null = null;
 
@@ -9,6 +9,7 @@ export function getSupabase(): SupabaseClient {
         if (!url || !key || url === "your_supabase_url") {
             throw new Error("SUPABASE_URL and SUPABASE_KEY required in .env");
         }
+        const { createClient } = require("@supabase/supabase-js") as typeof import("@supabase/supabase-js");
         supabase = createClient(url, key);
     }
     return supabase;
@@ -34,18 +35,22 @@ export async function upsertProfile(profile: UserProfile) {
     const db = getSupabase();
     const { data, error } = await db
         .from("profiles")
-        .upsert(profile, { onConflict: "email" })
+        .upsert({ ...profile, updated_at: new Date().toISOString() }, { onConflict: "email" })
         .select()
         .single();
     if (error) throw new Error(error.message);
     return data;
 }
 
-export async function getProfile(email: string) {
+// Profile columns without the resume_text body, for list/summary views
+export const PROFILE_SUMMARY_COLUMNS =
+    "id, email, name, username, avatar_url, skills, experience, education, location, target_role, created_at, updated_at" as const;
+
+export async function getProfile(email: string, columns: "*" | typeof PROFILE_SUMMARY_COLUMNS = "*") {
     const db = getSupabase();
     const { data, error } = await db
         .from("profiles")
-        .select("*")
+        .select(columns)
         .eq("email", email)
         .single();
     if (error && error.code !== "PGRST116") throw new Error(error.message);
@@ -87,6 +92,28 @@ export async function getApplications(email: string) {
     return data || [];
 }
 
+// Cursor-paginated summaries, newest first. Pass nextCursor back as `before`.
+export async function getApplicationsPage(
+    email: string,
+    options: { before?: string; limit?: number } = {},
+) {
+    const limit = options.limit || 20;
+    const db = getSupabase();
+    let query = db
+        .from("applications")
+        .select("id, job_title, company, job_url, status, applied_at", options.before ? {} : { count: "exact" })
+        .eq("user_email", email)
+        .order("applied_at", { ascending: false })
+        .limit(limit);
+    if (options.before) query = query.lt("applied_at", options.before);
+
+    const { data, error, count } = await query;
+    if (error) throw new Error(error.message);
+    const rows = data || [];
+    const nextCursor = rows.length === limit ? rows[rows.length - 1].applied_at as string : null;
+    return { applications: rows, nextCursor, total: count ?? undefined };
+}
+
 export async function updateApplicationStatus(id: string, status: string) {
     const db = getSupabase();
     const { data, error } = await db
@@ -105,28 +132,43 @@ export async function saveChatMessage(
     role: string,
     content: string,
     sessionId: string,
+    action?: string,
 ) {
     const db = getSupabase();
-    const { error } = await db.from("chat_history").insert({
-        user_email: userEmail,
-        role,
-        content,
-        session_id: sessionId,
-    });
+    const row = { user_email: userEmail, role, content, session_id: sessionId };
+    if (action) {
+        // `action` is only a training label (migrations/0005); never lose the message over it
+        const { error } = await db.from("chat_history").insert({ ...row, action });
+        if (!error) return;
+        console.warn(`chat_history.action not saved: ${error.message}`);
+    }
+    const { error } = await db.from("chat_history").insert(row);
     if (error) throw new Error(error.message);
 }
 
-export async function getChatHistory(userEmail: string, sessionId: string, limit = 20) {
+// Newest-first page of a session, returned oldest-first for display.
+// Pass the previous page's nextCursor as `before` to walk back in time.
+export async function getChatHistoryPage(
+    userEmail: string,
+    sessionId: string,
+    options: { before?: string; limit?: number } = {},
+) {
+    const limit = options.limit || 30;
     const db = getSupabase();
-    const { data, error } = await db
+    let query = db
         .from("chat_history")
-        .select("*")
+        .select("id, role, content, created_at")
         .eq("user_email", userEmail)
         .eq("session_id", sessionId)
-        .order("created_at", { ascending: true })
+        .order("created_at", { ascending: false })
         .limit(limit);
+    if (options.before) query = query.lt("created_at", options.before);
+
+    const { data, error } = await query;
     if (error) throw new Error(error.message);
-    return data || [];
+    const rows = (data || []).reverse();
+    const nextCursor = rows.length === limit ? rows[0].created_at as string : null;
+    return { history: rows, nextCursor };
 }
 
 export async function getChatSessions(userEmail: string) {
@@ -179,11 +221,14 @@ export async function saveResume(email: string, jobTitle: string, resumeText: st
     return data;
 }
 
-export async function getResumes(email: string) {
+// Resume rows without the resume_text body
+export const RESUME_SUMMARY_COLUMNS = "id, job_title, created_at" as const;
+
+export async function getResumes(email: string, columns: "*" | typeof RESUME_SUMMARY_COLUMNS = "*") {
     const db = getSupabase();
     const { data, error } = await db
         .from("resumes")
-        .select("*")
+        .select(columns)
         .eq("user_email", email)
         .order("created_at", { ascending: false })
         .limit(20);
@@ -191,6 +236,18 @@ export async function getResumes(email: string) {
     return data || [];
 }
 
+export async function getResume(email: string, id: string) {
+    const db = getSupabase();
+    const { data, error } = await db
+        .from("resumes")
+        .select("*")
+        .eq("user_email", email)
+        .eq("id", id)
+        .single();
+    if (error && error.code !== "PGRST116") throw new Error(error.message);
+    return data;
+}
+
 export async function renameChatSession(userEmail: string, sessionId: string, newTitle: string) {
     const db = getSupabase();
     // Assuming the title is stored in the very first message 'content' of that session. Let's add a robust implementation.
@@ -1,4 +1,4 @@
-type Message = { role: string; content: string };
+export type Message = { role: string; content: string };
 
 interface UserContext {
     profile: Record<string, unknown> | null;
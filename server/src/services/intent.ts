@@ -0,0 +1,232 @@
+import fs from "fs";
+import path from "path";
+
+// ─── Fast-path intent router ───
+// Naive Bayes over word unigrams + bigrams (English and Hinglish) for the
+// actions chat.ts serves straight from the database. Above the confidence
+// threshold the action is dispatched with a templated reply and the LLM is
+// skipped; everything else falls through to callGemini.
+//
+// Model:  data/intent-model.json (built by `npm run intent:train`)
+// Seeds:  data/intents.jsonl (used directly when no model file exists)
+// Eval:   `npm run intent:eval` → per-action precision/recall at the threshold
+
+export const FAST_PATH_ACTIONS = ["SHOW_APPLICATIONS", "SHOW_PLAN", "UPGRADE_PLAN"] as const;
+export type FastPathAction = typeof FAST_PATH_ACTIONS[number];
+export type IntentLabel = FastPathAction | "OTHER";
+export const INTENT_LABELS: IntentLabel[] = [...FAST_PATH_ACTIONS, "OTHER"];
+
+export interface LabeledExample {
+    text: string;
+    label: IntentLabel;
+}
+
+export interface IntentModel {
+    version: 1;
+    trainedAt: string;
+    examples: number;
+    logPriors: Record<IntentLabel, number>;
+    logLikelihoods: Record<IntentLabel, Record<string, number>>;
+    logUnseen: Record<IntentLabel, number>; // in-vocabulary feature never seen with this label
+}
+
+const DATA_DIR = path.join(__dirname, "../../data");
+export const SEED_PATH = path.join(DATA_DIR, "intents.jsonl");
+export const MODEL_PATH = path.join(DATA_DIR, "intent-model.json");
+
+const DEFAULT_THRESHOLD = 0.9;
+const MAX_FAST_PATH_LENGTH = 120; // long messages carry more than a lookup request
+
+// Hinglish spelling variants → one token
+const SPELLINGS: Record<string, string> = {
+    kia: "kya", kyaa: "kya", kiya: "kya",
+    meri: "mera", mere: "mera", mra: "mera", mujhe: "mera", muje: "mera", mjhe: "mera",
+    dikha: "dikhao", dikhado: "dikhao", dikhana: "dikhao", dikhaiye: "dikhao", dikhaye: "dikhao",
+    bata: "batao", btao: "batao", batado: "batao", bataiye: "batao", batana: "batao",
+    he: "hai", h: "hai", hain: "hai", hei: "hai",
+    krna: "karna", karo: "karna", krdo: "karna", kardo: "karna", karni: "karna",
+    application: "applications", apps: "applications", applys: "applications",
+    plans: "plan", subscription: "plan", subscriptions: "plan",
+    upgrad: "upgrade", upgrading: "upgrade", // not "upgraded": that's a report, not a request
+    pls: "please", plz: "please",
+    u: "you", ur: "your",
+};
+
+export function tokenize(text: string): string[] {
+    return text
+        .toLowerCase()
+        .normalize("NFKC")
+        .replace(/(\p{L})\1{2,}/gu, "$1") // "plzzz" → "plz", "kyaaa" → "kya"
+        .split(/[^\p{L}\p{N}]+/u)
+        .filter(Boolean)
+        .map((t) => SPELLINGS[t] || t);
+}
+
+// A fast-path action must be asked for in words it actually serves; "upgrade my
+// skills" or "my applications keep getting rejected" need the LLM however
+// confident the model is. Checked on normalized tokens (see SPELLINGS).
+const GUARDS: Record<FastPathAction, { requires: string[]; excludes?: string[] }> = {
+    SHOW_APPLICATIONS: {
+        requires: ["applications", "applied", "apply", "tracker"],
+        excludes: [
+            "reject", "rejected", "rejection", "follow", "update", "change", "mark", "set",
+            "why", "kyu", "kyun", "help", "tips", "improve", "write",
+        ],
+    },
+    SHOW_PLAN: {
+        requires: [
+            "plan", "pro", "premium", "free", "usage", "limit", "limits", "chats", "chat",
+            "applies", "left", "remaining", "bache", "price", "prices", "pricing", "cost",
+        ],
+    },
+    UPGRADE_PLAN: { requires: ["plan", "pro", "premium"] },
+};
+
+// Any action: negations, complaints and reports ("payment failed for pro", "upgrade
+// nahi karna", "upgraded but still free"), questions about the product ("why should i
+// upgrade"), and messages that chain a second request ("mera plan kya hai aur jobs
+// dhundo") — a templated reply would answer the wrong thing or drop half of it
+const ALWAYS_EXCLUDES = [
+    "not", "no", "don", "dont", "never", "nahi", "nhi", "mat",
+    "upgraded", "paid", "bought", "failed", "fail", "but", "still", "already", "refund", "cancel", "charged", "deducted",
+    "issue", "problem", "error", "wrong", "why", "kyu", "kyun", "worth",
+    "and", "aur", "then", "phir", "also", "plus",
+];
+
+function passesGuard(action: FastPathAction, text: string): boolean {
+    const tokens = tokenize(text);
+    const { requires, excludes = [] } = GUARDS[action];
+    return tokens.some((t) => requires.includes(t))
+        && !tokens.some((t) => excludes.includes(t) || ALWAYS_EXCLUDES.includes(t));
+}
+
+export function features(text: string): string[] {
+    const tokens = tokenize(text);
+    const out = tokens.map((t) => `w:${t}`);
+    for (let i = 0; i + 1 < tokens.length; i++) out.push(`b:${tokens[i]}_${tokens[i + 1]}`);
+    return out;
+}
+
+// Multinomial Naive Bayes with Laplace smoothing
+export function trainIntentModel(examples: LabeledExample[]): IntentModel {
+    const docCounts = {} as Record<IntentLabel, number>;
+    const featureCounts = {} as Record<IntentLabel, Map<string, number>>;
+    const totals = {} as Record<IntentLabel, number>;
+    const vocabulary = new Set<string>();
+
+    for (const label of INTENT_LABELS) {
+        docCounts[label] = 0;
+        featureCounts[label] = new Map();
+        totals[label] = 0;
+    }
+    for (const { text, label } of examples) {
+        docCounts[label]++;
+        for (const f of features(text)) {
+            vocabulary.add(f);
+            featureCounts[label].set(f, (featureCounts[label].get(f) || 0) + 1);
+            totals[label]++;
+        }
+    }
+
+    const model: IntentModel = {
+        version: 1,
+        trainedAt: new Date().toISOString(),
+        examples: examples.length,
+        logPriors: {} as Record<IntentLabel, number>,
+        logLikelihoods: {} as Record<IntentLabel, Record<string, number>>,
+        logUnseen: {} as Record<IntentLabel, number>,
+    };
+    for (const label of INTENT_LABELS) {
+        const denominator = totals[label] + vocabulary.size;
+        model.logPriors[label] = Math.log((docCounts[label] + 1) / (examples.length + INTENT_LABELS.length));
+        model.logUnseen[label] = Math.log(1 / denominator);
+        model.logLikelihoods[label] = {};
+        for (const [f, count] of featureCounts[label]) {
+            model.logLikelihoods[label][f] = Math.log((count + 1) / denominator);
+        }
+    }
+    return model;
+}
+
+export function classify(model: IntentModel, text: string): { label: IntentLabel; confidence: number } {
+    // Features no label has seen carry no evidence either way
+    const known = features(text).filter((f) => INTENT_LABELS.some((l) => f in model.logLikelihoods[l]));
+    const scores = INTENT_LABELS.map((label) => {
+        let score = model.logPriors[label];
+        for (const f of known) score += model.logLikelihoods[label][f] ?? model.logUnseen[label];
+        return score;
+    });
+
+    // Softmax → posterior probability of the winning label
+    const max = Math.max(...scores);
+    const exp = scores.map((s) => Math.exp(s - max));
+    const sum = exp.reduce((a, b) => a + b, 0);
+    const best = scores.indexOf(max);
+    return { label: INTENT_LABELS[best], confidence: exp[best] / sum };
+}
+
+// The action to dispatch without the LLM, or null. Shared by matchIntent and `intent:eval`
+export function routeIntent(model: IntentModel, text: string, threshold: number): { action: FastPathAction; confidence: number } | null {
+    const { label, confidence } = classify(model, text);
+    if (label === "OTHER" || confidence < threshold) return null;
+    if (!passesGuard(label, text)) return null;
+    return { action: label, confidence };
+}
+
+export function loadExamples(file: string): LabeledExample[] {
+    return fs
+        .readFileSync(file, "utf8")
+        .split("\n")
+        .filter((line) => line.trim())
+        .map((line) => JSON.parse(line) as LabeledExample)
+        .filter((e) => INTENT_LABELS.includes(e.label));
+}
+
+let model: IntentModel | null = null;
+
+export function getIntentModel(): IntentModel {
+    if (!model) {
+        model = fs.existsSync(MODEL_PATH)
+            ? (JSON.parse(fs.readFileSync(MODEL_PATH, "utf8")) as IntentModel)
+            : trainIntentModel(loadExamples(SEED_PATH));
+    }
+    return model;
+}
+
+const REPLIES: Record<FastPathAction, string[]> = {
+    SHOW_APPLICATIONS: [
+        "Here are the jobs you've applied to 📋",
+        "Here's your application tracker 📋",
+    ],
+    SHOW_PLAN: [
+        "Here's your current plan and today's usage 📊",
+        "Here's your plan and what you've used today 📊",
+    ],
+    UPGRADE_PLAN: [
+        "Great choice! Here are the upgrade options 🚀",
+        "Let's get you upgraded 🚀",
+    ],
+};
+
+// Returns a dispatchable action, or null to fall back to the LLM
+export function matchIntent(message: string): { action: FastPathAction; confidence: number; reply: string } | null {
+    if (process.env.INTENT_FAST_PATH === "off") return null;
+    if (message.length > MAX_FAST_PATH_LENGTH) return null;
+    if (message.includes("[Attached File Context]") || /https?:\/\//.test(message)) return null;
+
+    let result: { action: FastPathAction; confidence: number } | null;
+    try {
+        const threshold = Number(process.env.INTENT_THRESHOLD) || DEFAULT_THRESHOLD;
+        result = routeIntent(getIntentModel(), message, threshold);
+    } catch {
+        return null; // no model and no seeds — always safe to use the LLM
+    }
+    if (!result) return null;
+
+    const replies = REPLIES[result.action];
+    return {
+        action: result.action,
+        confidence: result.confidence,
+        reply: replies[Math.floor(Math.random() * replies.length)],
+    };
+}
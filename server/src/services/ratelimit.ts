@@ -0,0 +1,71 @@
+import { Request } from "express";
+import rateLimit, { ipKeyGenerator, Store, Options, ClientRateLimitInfo } from "express-rate-limit";
+import { getStore } from "./store";
+import { identifyUser } from "./auth";
+import { getUserPlan, PlanType } from "./subscription";
+
+// Requests per minute, per signed-in user (anonymous traffic falls back to IP)
+const RATE_LIMITS: Record<PlanType | "anonymous", number> = {
+    anonymous: 30,
+    free: 30,
+    pro: 120,
+    premium: 300,
+};
+
+const WINDOW_MS = 1 * 60 * 1000;
+
+// Adapts the shared store to express-rate-limit so counters are shared across workers.
+// getStore() is resolved per call: this module loads before dotenv.config() runs.
+class SharedRateLimitStore implements Store {
+    prefix = "rl:";
+    localKeys = false;
+    private windowMs = WINDOW_MS;
+
+    init(options: Options) {
+        this.windowMs = options.windowMs;
+    }
+
+    async increment(key: string): Promise<ClientRateLimitInfo> {
+        const { count, resetAt } = await getStore().incr(this.prefix + key, this.windowMs);
+        return { totalHits: count, resetTime: new Date(resetAt) };
+    }
+
+    async decrement(key: string) {
+        await getStore().decr(this.prefix + key);
+    }
+
+    async resetKey(key: string) {
+        await getStore().del(this.prefix + key);
+    }
+}
+
+interface RateLimitIdentity {
+    key: string;
+    tier: PlanType | "anonymous";
+}
+
+// keyGenerator and limit both need the identity; resolve it once per request
+const identities = new WeakMap<Request, Promise<RateLimitIdentity>>();
+
+function identify(req: Request): Promise<RateLimitIdentity> {
+    let identity = identities.get(req);
+    if (!identity) {
+        identity = (async (): Promise<RateLimitIdentity> => {
+            const user = await identifyUser(req);
+            if (!user) return { key: `ip:${ipKeyGenerator(req.ip || "")}`, tier: "anonymous" };
+            const plan = await getUserPlan(user.email).catch((): PlanType => "free");
+            return { key: `user:${user.email}`, tier: plan };
+        })();
+        identities.set(req, identity);
+    }
+    return identity;
+}
+
+export const rateLimiter = rateLimit({
+    windowMs: WINDOW_MS,
+    limit: async (req) => RATE_LIMITS[(await identify(req)).tier],
+    keyGenerator: async (req) => (await identify(req)).key,
+    store: new SharedRateLimitStore(),
+    passOnStoreError: true, // fail open: a store outage must not take every endpoint down with it
+    message: { error: "Too many requests, slow down." },
+});
@@ -0,0 +1,72 @@
+import Module from "module";
+import path from "path";
+
+// ─── Startup profile ───
+// STARTUP_PROFILE=1 times every require() made by our own code while the
+// server boots and prints the slowest ones once listen() fires. Anything
+// loaded afterwards (lazy routes, prewarm) is reported separately as
+// "deferred". Must be the first import in index.ts, and the variable must be
+// set in the real environment — .env is read after imports run.
+
+interface ImportTiming {
+    request: string;
+    from: string;
+    ms: number;
+    depth: number;
+}
+
+const enabled = !!process.env.STARTUP_PROFILE && process.env.STARTUP_PROFILE !== "0";
+const MIN_MS = 0.5;     // cached modules and tiny files are noise
+const REPORT_LIMIT = 20;
+
+const timings: { boot: ImportTiming[]; deferred: ImportTiming[] } = { boot: [], deferred: [] };
+let phase: keyof typeof timings = "boot";
+let depth = 0;
+
+if (enabled) {
+    const loader = Module as unknown as {
+        _load(request: string, parent: NodeModule | null, isMain: boolean): unknown;
+    };
+    const original = loader._load;
+    loader._load = (request, parent, isMain) => {
+        const started = performance.now();
+        depth++;
+        try {
+            return original.call(loader, request, parent, isMain);
+        } finally {
+            depth--;
+            const ms = performance.now() - started;
+            // Our modules and the packages they import directly; a package's own internals roll up into it
+            const fromOurCode = !!parent?.filename && !parent.filename.includes(`${path.sep}node_modules${path.sep}`);
+            if (ms >= MIN_MS && (depth === 0 || fromOurCode)) {
+                timings[phase].push({
+                    request,
+                    from: parent?.filename ? path.relative(process.cwd(), parent.filename) : "",
+                    ms,
+                    depth,
+                });
+            }
+        }
+    };
+}
+
+export function markListening() {
+    if (!enabled) return;
+    reportStartupProfile("boot");
+    phase = "deferred";
+}
+
+export function reportStartupProfile(which: keyof typeof timings) {
+    if (!enabled) return;
+    const rows = timings[which];
+    const topLevel = rows.filter((t) => t.depth === 0).reduce((sum, t) => sum + t.ms, 0);
+    const heading = which === "boot"
+        ? `listening ${Math.round(process.uptime() * 1000)} ms after process start, ${Math.round(topLevel)} ms in imports`
+        : `${Math.round(topLevel)} ms of imports after listen`;
+
+    console.log(`\n⏱  Startup profile (${which}) — ${heading}`);
+    for (const t of [...rows].sort((a, b) => b.ms - a.ms).slice(0, REPORT_LIMIT)) {
+        console.log(`   ${t.ms.toFixed(1).padStart(8)} ms  ${t.request.padEnd(32)} ← ${t.from}`);
+    }
+    console.log("");
+}
@@ -0,0 +1,361 @@
+import cluster, { Worker } from "cluster";
+import net from "net";
+import tls from "tls";
+
+// Shared key/value store for rate-limit counters and server caches.
+// STORE_URL=redis://host:port → any Redis-compatible server (Redis, Valkey, KeyDB, Dragonfly)
+// cluster worker without STORE_URL → counters live in the primary process, shared over IPC
+// single process → plain in-memory map
+export interface SharedStore {
+    get(key: string): Promise<string | null>;
+    set(key: string, value: string, ttlMs: number): Promise<void>;
+    del(key: string): Promise<void>;
+    // Increments a counter, starting a window of windowMs on the first hit
+    incr(key: string, windowMs: number): Promise<{ count: number; resetAt: number }>;
+    decr(key: string): Promise<void>;
+}
+
+// Every request hits the store through the rate limiter, so a slow or absent
+// backend must fail fast rather than hang; callers treat a rejection as a miss
+function storeTimeoutMs() {
+    return Number(process.env.STORE_TIMEOUT_MS) || 500;
+}
+
+// ─── In-memory ───
+export class MemoryStore implements SharedStore {
+    private entries = new Map<string, { value: string; expiresAt: number }>();
+
+    constructor() {
+        // Sweep expired keys so idle users don't pile up
+        setInterval(() => {
+            const now = Date.now();
+            for (const [key, entry] of this.entries) {
+                if (entry.expiresAt <= now) this.entries.delete(key);
+            }
+        }, 60 * 1000).unref();
+    }
+
+    private live(key: string) {
+        const entry = this.entries.get(key);
+        if (!entry) return null;
+        if (entry.expiresAt <= Date.now()) {
+            this.entries.delete(key);
+            return null;
+        }
+        return entry;
+    }
+
+    async get(key: string) {
+        return this.live(key)?.value ?? null;
+    }
+
+    async set(key: string, value: string, ttlMs: number) {
+        this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+    }
+
+    async del(key: string) {
+        this.entries.delete(key);
+    }
+
+    async incr(key: string, windowMs: number) {
+        const entry = this.live(key);
+        if (!entry) {
+            const resetAt = Date.now() + windowMs;
+            this.entries.set(key, { value: "1", expiresAt: resetAt });
+            return { count: 1, resetAt };
+        }
+        const count = Number(entry.value) + 1;
+        entry.value = String(count);
+        return { count, resetAt: entry.expiresAt };
+    }
+
+    async decr(key: string) {
+        const entry = this.live(key);
+        if (entry) entry.value = String(Math.max(0, Number(entry.value) - 1));
+    }
+}
+
+// ─── Cluster IPC (primary holds the data) ───
+const STORE_REQUEST = "hirekit:store";
+const STORE_REPLY = "hirekit:store:reply";
+
+type StoreOp = "get" | "set" | "del" | "incr" | "decr";
+
+interface StoreRequest {
+    type: typeof STORE_REQUEST;
+    id: number;
+    op: StoreOp;
+    args: unknown[];
+}
+
+interface StoreReply {
+    type: typeof STORE_REPLY;
+    id: number;
+    result?: unknown;
+    error?: string;
+}
+
+export class ClusterStore implements SharedStore {
+    private seq = 0;
+    private pending = new Map<number, { resolve: (v: any) => void; reject: (e: Error) => void }>();
+    private answered = false; // the primary has replied at least once
+    private unserved = false; // it never did — e.g. PM2 cluster mode, which doesn't run cluster.ts
+
+    constructor() {
+        process.on("message", (msg: StoreReply) => {
+            if (!msg || msg.type !== STORE_REPLY) return;
+            this.answered = true;
+            const waiter = this.pending.get(msg.id);
+            if (!waiter) return; // already timed out
+            this.pending.delete(msg.id);
+            if (msg.error) waiter.reject(new Error(msg.error));
+            else waiter.resolve(msg.result);
+        });
+    }
+
+    private call<T>(op: StoreOp, args: unknown[]): Promise<T> {
+        return new Promise((resolve, reject) => {
+            if (this.unserved) return reject(new Error("Cluster store unavailable: primary does not serve it"));
+            if (!process.send || !process.connected) {
+                return reject(new Error("Cluster store unavailable: no IPC channel"));
+            }
+            const id = ++this.seq;
+            const timer = setTimeout(() => {
+                this.pending.delete(id);
+                if (!this.answered && !this.unserved) {
+                    this.unserved = true;
+                    console.warn("Cluster store: no reply from the primary; run dist/cluster.js or set STORE_URL. Caches and rate limits are disabled in this worker.");
+                }
+                reject(new Error(`Cluster store ${op} timed out`));
+            }, storeTimeoutMs());
+            this.pending.set(id, {
+                resolve: (v) => { clearTimeout(timer); resolve(v); },
+                reject: (e) => { clearTimeout(timer); reject(e); },
+            });
+            const request: StoreRequest = { type: STORE_REQUEST, id, op, args };
+            process.send(request);
+        });
+    }
+
+    get(key: string) {
+        return this.call<string | null>("get", [key]);
+    }
+
+    set(key: string, value: string, ttlMs: number) {
+        return this.call<void>("set", [key, value, ttlMs]);
+    }
+
+    del(key: string) {
+        return this.call<void>("del", [key]);
+    }
+
+    incr(key: string, windowMs: number) {
+        return this.call<{ count: number; resetAt: number }>("incr", [key, windowMs]);
+    }
+
+    decr(key: string) {
+        return this.call<void>("decr", [key]);
+    }
+}
+
+// Called by the primary for every forked worker
+export function serveClusterStore(worker: Worker, store: SharedStore) {
+    worker.on("message", async (msg: StoreRequest) => {
+        if (!msg || msg.type !== STORE_REQUEST) return;
+        const reply: StoreReply = { type: STORE_REPLY, id: msg.id };
+        try {
+            reply.result = await (store[msg.op] as (...args: unknown[]) => Promise<unknown>).apply(store, msg.args);
+        } catch (err) {
+            reply.error = (err as Error).message;
+        }
+        if (worker.isConnected()) worker.send(reply);
+    });
+}
+
+// ─── Redis-compatible (RESP over TCP, no client dependency) ───
+type RespValue = string | number | null | RespValue[];
+
+// Parses one reply starting at offset; returns null if the buffer is incomplete
+function parseReply(buf: Buffer, offset: number): { value: RespValue | Error; next: number } | null {
+    if (offset >= buf.length) return null;
+    const lineEnd = buf.indexOf("\r\n", offset);
+    if (lineEnd === -1) return null;
+    const type = String.fromCharCode(buf[offset]);
+    const line = buf.toString("utf8", offset + 1, lineEnd);
+    const next = lineEnd + 2;
+
+    switch (type) {
+        case "+":
+            return { value: line, next };
+        case "-":
+            return { value: new Error(line), next };
+        case ":":
+            return { value: Number(line), next };
+        case "$": {
+            const len = Number(line);
+            if (len === -1) return { value: null, next };
+            if (buf.length < next + len + 2) return null;
+            return { value: buf.toString("utf8", next, next + len), next: next + len + 2 };
+        }
+        case "*": {
+            const count = Number(line);
+            if (count === -1) return { value: null, next };
+            const items: RespValue[] = [];
+            let cursor = next;
+            for (let i = 0; i < count; i++) {
+                const item = parseReply(buf, cursor);
+                if (!item) return null;
+                if (item.value instanceof Error) return item;
+                items.push(item.value);
+                cursor = item.next;
+            }
+            return { value: items, next: cursor };
+        }
+        default:
+            throw new Error(`Unexpected RESP type "${type}"`);
+    }
+}
+
+function encodeCommand(args: (string | number)[]): string {
+    let out = `*${args.length}\r\n`;
+    for (const arg of args) {
+        const s = String(arg);
+        out += `$${Buffer.byteLength(s)}\r\n${s}\r\n`;
+    }
+    return out;
+}
+
+// INCR + window expiry in one round trip; also repairs counters that lost their TTL
+const INCR_SCRIPT = `
+local n = redis.call('INCR', KEYS[1])
+if n == 1 then redis.call('PEXPIRE', KEYS[1], ARGV[1]) end
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl < 0 then redis.call('PEXPIRE', KEYS[1], ARGV[1]); ttl = tonumber(ARGV[1]) end
+return {n, ttl}
+`;
+
+export class RedisStore implements SharedStore {
+    private socket: net.Socket | null = null;
+    private buffer = Buffer.alloc(0);
+    private pending: Array<{ resolve: (v: RespValue) => void; reject: (e: Error) => void }> = [];
+
+    constructor(private url: URL) {}
+
+    private connect(): net.Socket {
+        const host = this.url.hostname || "127.0.0.1";
+        const port = Number(this.url.port) || 6379;
+        const socket: net.Socket = this.url.protocol === "rediss:"
+            ? tls.connect({ host, port, servername: host })
+            : net.createConnection({ host, port });
+        socket.setNoDelay(true);
+        socket.on("data", (chunk) => this.onData(chunk));
+        // A socket dropped after a timeout still emits close; it must not tear down its replacement
+        socket.on("error", (err) => this.socket === socket && this.teardown(err));
+        socket.on("close", () => this.socket === socket && this.teardown(new Error("Redis connection closed")));
+        this.socket = socket;
+
+        // Queued ahead of the caller's command, so ordering is preserved
+        if (this.url.password) {
+            const auth = this.url.username
+                ? ["AUTH", decodeURIComponent(this.url.username), decodeURIComponent(this.url.password)]
+                : ["AUTH", decodeURIComponent(this.url.password)];
+            this.send(auth).catch(() => {});
+        }
+        const db = this.url.pathname.replace("/", "");
+        if (db) this.send(["SELECT", db]).catch(() => {});
+
+        return socket;
+    }
+
+    private teardown(err: Error) {
+        this.socket?.destroy();
+        this.socket = null;
+        this.buffer = Buffer.alloc(0);
+        const waiting = this.pending;
+        this.pending = [];
+        for (const w of waiting) w.reject(err);
+    }
+
+    private onData(chunk: Buffer) {
+        this.buffer = this.buffer.length ? Buffer.concat([this.buffer, chunk]) : chunk;
+        let offset = 0;
+        while (this.pending.length) {
+            const reply = parseReply(this.buffer, offset);
+            if (!reply) break;
+            offset = reply.next;
+            const waiter = this.pending.shift()!;
+            if (reply.value instanceof Error) waiter.reject(reply.value);
+            else waiter.resolve(reply.value);
+        }
+        this.buffer = this.buffer.subarray(offset);
+    }
+
+    private send(args: (string | number)[]): Promise<RespValue> {
+        const socket = this.socket || this.connect();
+        return new Promise((resolve, reject) => {
+            // Replies are matched by order, so one lost reply desyncs the connection:
+            // a timeout (including a connect that never completes) drops it and fails everything queued
+            const timer = setTimeout(() => {
+                if (this.socket === socket) this.teardown(new Error(`Redis ${args[0]} timed out`));
+            }, storeTimeoutMs());
+            this.pending.push({
+                resolve: (v) => { clearTimeout(timer); resolve(v); },
+                reject: (e) => { clearTimeout(timer); reject(e); },
+            });
+            socket.write(encodeCommand(args));
+        });
+    }
+
+    async get(key: string) {
+        return (await this.send(["GET", key])) as string | null;
+    }
+
+    async set(key: string, value: string, ttlMs: number) {
+        await this.send(["SET", key, value, "PX", Math.max(1, Math.round(ttlMs))]);
+    }
+
+    async del(key: string) {
+        await this.send(["DEL", key]);
+    }
+
+    async incr(key: string, windowMs: number) {
+        const [count, ttl] = (await this.send(["EVAL", INCR_SCRIPT, 1, key, windowMs])) as number[];
+        return { count, resetAt: Date.now() + ttl };
+    }
+
+    async decr(key: string) {
+        await this.send(["DECR", key]);
+    }
+}
+
+// ─── Singleton ───
+let store: SharedStore | null = null;
+
+export function getStore(): SharedStore {
+    if (!store) {
+        const url = process.env.STORE_URL;
+        if (url && /^rediss?:/.test(url)) {
+            store = new RedisStore(new URL(url));
+        } else if (cluster.isWorker) {
+            store = new ClusterStore();
+        } else {
+            store = new MemoryStore();
+        }
+    }
+    return store;
+}
+
+// Read-through cache for JSON-serialisable values
+export async function cached<T>(key: string, ttlMs: number, load: () => Promise<T>): Promise<T> {
+    const store = getStore();
+    try {
+        const hit = await store.get(key);
+        if (hit !== null) return JSON.parse(hit) as T;
+    } catch {
+        // Store unavailable — fall through to the source
+    }
+
+    const value = await load();
+    store.set(key, JSON.stringify(value), ttlMs).catch(() => {});
+    return value;
+}
@@ -1,4 +1,5 @@
 import { getSupabase } from "./database";
+import { cached, getStore } from "./store";
 
 // Plan limits
 const PLAN_LIMITS = {
@@ -9,17 +10,26 @@ const PLAN_LIMITS = {
 
 export type PlanType = "free" | "pro" | "premium";
 
+// Plans change rarely; upgrades call invalidateUserPlan
+const PLAN_CACHE_MS = 60 * 1000;
+
 // Get user's plan
 export async function getUserPlan(email: string): Promise<PlanType> {
-    const db = getSupabase();
-    const { data } = await db
-        .from("subscriptions")
-        .select("plan, status")
-        .eq("email", email)
-        .eq("status", "active")
-        .single();
+    return cached(`plan:${email}`, PLAN_CACHE_MS, async () => {
+        const db = getSupabase();
+        const { data } = await db
+            .from("subscriptions")
+            .select("plan, status")
+            .eq("email", email)
+            .eq("status", "active")
+            .single();
+
+        return (data?.plan as PlanType) || "free";
+    });
+}
 
-    return (data?.plan as PlanType) || "free";
+export async function invalidateUserPlan(email: string): Promise<void> {
+    await getStore().del(`plan:${email}`).catch(() => {});
 }
 
 // Check if user can perform action
@@ -38,10 +48,10 @@ export async function checkUsage(
     const db = getSupabase();
     const today = new Date().toISOString().split("T")[0];
 
-    // Get or create today's usage
+    // Get or create today's usage (columns match idx_usage_email_date_counts → index-only scan)
     const { data: usage } = await db
         .from("usage")
-        .select("*")
+        .select("chat_count, apply_count, resume_count, upload_count")
         .eq("email", email)
         .eq("date", today)
         .single();
@@ -68,7 +78,7 @@ export async function incrementUsage(
     // Upsert: create row if doesn't exist, increment if it does
     const { data: existing } = await db
         .from("usage")
-        .select("*")
+        .select("id, chat_count, apply_count, resume_count, upload_count")
         .eq("email", email)
         .eq("date", today)
         .single();
@@ -97,7 +107,7 @@ export async function getUsageSummary(email: string) {
 
     const { data: usage } = await db
         .from("usage")
-        .select("*")
+        .select("chat_count, apply_count, resume_count, upload_count")
         .eq("email", email)
         .eq("date", today)
         .single();
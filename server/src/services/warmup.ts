@@ -0,0 +1,101 @@
+import type { Request, Response, NextFunction, Router } from "express";
+import { setImmediate as nextTick } from "timers/promises";
+
+// ─── Readiness & prewarm ───
+// Heavy subsystems load on first use so listen() happens as early as
+// possible. prewarm() then loads them in the background, and /api/health
+// reports each one as cold / warming / warm (or failed / disabled).
+
+export type WarmState = "cold" | "warming" | "warm" | "failed" | "disabled";
+
+// Served on the public /api/health, so failures carry no detail; the reason is logged
+export interface SubsystemStatus {
+    state: WarmState;
+    ms?: number;
+}
+
+const SUBSYSTEMS = ["routes", "supabase", "google", "razorpay", "pdf", "browser"] as const;
+type Subsystem = typeof SUBSYSTEMS[number];
+
+// Ready means these can serve without a cold load; the rest are optional
+const CRITICAL: Subsystem[] = ["routes", "supabase", "google"];
+
+const status = Object.fromEntries(SUBSYSTEMS.map((name) => [name, { state: "cold" }])) as Record<Subsystem, SubsystemStatus>;
+
+// Called when a subsystem is loaded on demand by a request rather than by prewarm
+export function markWarm(name: Subsystem) {
+    if (status[name].state !== "warm") status[name] = { state: "warm" };
+}
+
+async function warm(name: Subsystem, task: () => unknown) {
+    if (status[name].state === "warm") return;
+    const started = performance.now();
+    status[name] = { state: "warming" };
+    try {
+        await task();
+        status[name] = { state: "warm", ms: Math.round(performance.now() - started) };
+    } catch (err) {
+        status[name] = { state: "failed" };
+        console.error(`Prewarm ${name} failed: ${(err as Error).message}`);
+    }
+}
+
+// ─── Lazy routers ───
+const routerLoaders: Array<() => Router> = [];
+let routersLoaded = 0;
+
+// Mounts a router whose module is required on first request (or by prewarm)
+export function lazyRouter(load: () => Router) {
+    let router: Router | null = null;
+    const get = () => {
+        if (!router) {
+            router = load();
+            if (++routersLoaded === routerLoaders.length) markWarm("routes");
+        }
+        return router;
+    };
+    routerLoaders.push(get);
+    return (req: Request, res: Response, next: NextFunction) => get()(req, res, next);
+}
+
+// ─── Prewarm ───
+export async function prewarm(): Promise<void> {
+    // Requires are synchronous — yield between routers so early requests aren't stalled behind them
+    await warm("routes", async () => {
+        for (const get of routerLoaders) {
+            await nextTick();
+            get();
+        }
+    });
+
+    const supabaseConfigured = !!process.env.SUPABASE_URL && process.env.SUPABASE_URL !== "your_supabase_url";
+    const razorpayConfigured = !!process.env.RAZORPAY_KEY_ID && !!process.env.RAZORPAY_KEY_SECRET;
+    if (!supabaseConfigured) status.supabase = { state: "disabled" };
+    if (!razorpayConfigured) status.razorpay = { state: "disabled" };
+    if (!process.env.GOOGLE_CLIENT_ID) status.google = { state: "disabled" };
+
+    await Promise.all([
+        supabaseConfigured && warm("supabase", async () => {
+            const { getSupabase } = require("./database") as typeof import("./database");
+            // Opens the HTTP connection and checks the key
+            const { error } = await getSupabase().from("subscriptions").select("id").limit(1);
+            if (error) throw new Error(error.message);
+        }),
+        process.env.GOOGLE_CLIENT_ID && warm("google", async () => {
+            const { warmGoogleCerts } = require("./auth") as typeof import("./auth");
+            await warmGoogleCerts();
+        }),
+        razorpayConfigured && warm("razorpay", () => require("razorpay")),
+        warm("pdf", () => require("pdf-parse")),
+        // Chrome costs ~100 MB per worker, so it stays cold unless asked for
+        process.env.PREWARM_BROWSER === "1" && warm("browser", async () => {
+            const { warmBrowser } = await import("./autoapply");
+            await warmBrowser();
+        }),
+    ]);
+}
+
+export function readiness(): { ready: boolean; subsystems: Record<Subsystem, SubsystemStatus> } {
+    const ready = CRITICAL.every((name) => status[name].state === "warm" || status[name].state === "disabled");
+    return { ready, subsystems: { ...status } };
+}
@@ -1,4 +1,5 @@
 -- HireKit Database Schema (Supabase as database only, auth via Google Cloud Console)
+-- Baseline only: apply later changes with `python migrate.py up` (see server/migrations/)
 
 -- Users (from Google login)
 CREATE TABLE IF NOT EXISTS users (
@@ -4,6 +4,7 @@ import { useState, useRef, useEffect, Suspense } from "react";
 import { useRouter, useSearchParams } from "next/navigation";
 import { Paperclip, ArrowUp, X, Menu, Trash2, Plus, Pin, Pencil, LogOut, Mic } from "lucide-react";
 import { ResumePreview } from "@/components/ResumePreview";
+import { VirtualMessageList } from "@/components/VirtualMessageList";
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:4000";
 
@@ -133,6 +134,8 @@ function HomeInner() {
     const [loading, setLoading] = useState(false);
     const [uploading, setUploading] = useState(false);
     const [sessionId, setSessionId] = useState(() => Date.now().toString());
+    const [historyCursor, setHistoryCursor] = useState<string | null>(null);
+    const [loadingOlder, setLoadingOlder] = useState(false);
     const [selectedFile, setSelectedFile] = useState<File | null>(null);
     const [sidebarOpen, setSidebarOpen] = useState(false);
     const [sessions, setSessions] = useState<{ id: string, title: string }[]>([]);
@@ -268,9 +271,15 @@ function HomeInner() {
         // eslint-disable-next-line react-hooks/exhaustive-deps
     }, []);
 
+    // Follow new messages at the bottom, but not when older turns are prepended
+    const lastMessageId = messages[messages.length - 1]?.id;
     useEffect(() => {
         bottomRef.current?.scrollIntoView({ behavior: "smooth" });
-    }, [messages]);
+    }, [lastMessageId, loading]);
+
+    const toChatMessages = (history: any[]): ChatMessage[] => history.map((h: any) => ({
+        id: h.id || Date.now().toString(), role: h.role, content: h.content, action: "NONE"
+    }));
 
 
 
@@ -279,19 +288,38 @@ function HomeInner() {
         if (!tk) return;
 
         try {
-            const res = await fetch(`${API_URL}/api/chat/history/${id}`, { headers: { Authorization: `Bearer ${tk}` } });
+            const res = await fetch(`${API_URL}/api/chat/history/${id}?limit=30`, { headers: { Authorization: `Bearer ${tk}` } });
             const data = await res.json();
             if (data.history) {
                 setSessionId(id);
-                setMessages(data.history.map((h: any) => ({
-                    id: h.id || Date.now().toString(), role: h.role, content: h.content, action: "NONE"
-                })));
+                setMessages(toChatMessages(data.history));
+                setHistoryCursor(data.nextCursor || null);
             }
         } catch (err) { }
 
         setSidebarOpen(false);
     };
 
+    // Older turns, fetched as the user scrolls up
+    const loadOlder = async () => {
+        const tk = localStorage.getItem("hirekit_token");
+        if (!tk || !historyCursor || loadingOlder) return;
+
+        setLoadingOlder(true);
+        try {
+            const res = await fetch(
+                `${API_URL}/api/chat/history/${sessionId}?limit=30&before=${encodeURIComponent(historyCursor)}`,
+                { headers: { Authorization: `Bearer ${tk}` } },
+            );
+            const data = await res.json();
+            if (data.history) {
+                setMessages((prev) => [...toChatMessages(data.history), ...prev]);
+                setHistoryCursor(data.nextCursor || null);
+            }
+        } catch (err) { }
+        setLoadingOlder(false);
+    };
+
     const deleteChat = async (idToDelete: string) => {
         const tk = localStorage.getItem("hirekit_token");
         if (!tk) return;
@@ -300,6 +328,7 @@ function HomeInner() {
             if (sessionId === idToDelete) {
                 setMessages([]);
                 setSessionId(Date.now().toString());
+                setHistoryCursor(null);
             }
             loadSessions();
         } catch (e) { }
@@ -328,6 +357,17 @@ function HomeInner() {
         setEditingChatId(null);
     };
 
+    // Google ID tokens expire after an hour; past that the server can't read this session's history
+    const hasFreshToken = (tk: string | null) => {
+        if (!tk) return false;
+        try {
+            const payload = JSON.parse(atob(tk.split(".")[1].replace(/-/g, "+").replace(/_/g, "/")));
+            return payload.exp * 1000 > Date.now() + 60 * 1000;
+        } catch {
+            return false;
+        }
+    };
+
     // File upload
     const send = async (text?: string) => {
         const msg = (text || input).trim();
@@ -385,9 +425,12 @@ ${fileContext}` : fileContext;
                 headers,
                 body: JSON.stringify({
                     message: aiPayloadMessage || "Read the attached file.",
-                    history: messages.map((m) => ({ role: m.role, content: m.content })),
-                    email: user?.email,
+                    email: user?.email, // history is kept server-side per sessionId
                     sessionId,
+                    // ...unless the token has expired, in which case send the recent tail ourselves
+                    ...(hasFreshToken(tk) ? {} : {
+                        history: messages.slice(-20).map(({ role, content }) => ({ role, content })),
+                    }),
                 }),
             });
 
@@ -625,7 +668,7 @@ ${fileContext}` : fileContext;
                         <div style={{ padding: 16, borderBottom: "1px solid #eee", display: "flex", justifyContent: "space-between", alignItems: "center" }}>
                             <span style={{ fontWeight: 600, fontSize: 14 }}>Chats</span>
                             <div style={{ display: "flex", gap: 12 }}>
-                                <button onClick={() => { setSessionId(Date.now().toString()); setMessages([]); setSidebarOpen(false); }} style={{ background: "none", border: "none", cursor: "pointer", color: "#666" }} title="New Chat"><Plus size={18} /></button>
+                                <button onClick={() => { setSessionId(Date.now().toString()); setMessages([]); setHistoryCursor(null); setSidebarOpen(false); }} style={{ background: "none", border: "none", cursor: "pointer", color: "#666" }} title="New Chat"><Plus size={18} /></button>
                                 <button onClick={() => setSidebarOpen(false)} style={{ background: "none", border: "none", cursor: "pointer", color: "#666" }}><X size={18} /></button>
                             </div>
                         </div>
@@ -723,66 +766,72 @@ ${fileContext}` : fileContext;
                     </div>
                 </header>
 
-                {/* Messages */}
-                <main style={{ flex: 1, overflowY: "auto", padding: "20px 16px" }}>
-                    <div style={{ maxWidth: 700, margin: "0 auto" }}>
-                        {messages.map((msg) => (
-                            <div key={msg.id} style={{
-                                display: "flex", gap: 10, marginBottom: 20,
-                                flexDirection: msg.role === "user" ? "row-reverse" : "row",
-                            }}>
-                                {msg.role === "assistant" && (
-                                    <img src="/favicon.png" alt="AI" style={{ width: 28, height: 28, flexShrink: 0, marginTop: 2 }} />
-                                )}
-                                <div style={{ maxWidth: "85%", overflow: "hidden" }}>
-                                    <div style={{
-                                        padding: "10px 14px", borderRadius: 16, fontSize: 14, lineHeight: 1.6,
-                                        whiteSpace: "pre-wrap",
-                                        background: msg.role === "user" ? "#111" : "#f4f4f4",
-                                        color: msg.role === "user" ? "#fff" : "#111",
-                                        borderBottomRightRadius: msg.role === "user" ? 4 : 16,
-                                        borderBottomLeftRadius: msg.role === "assistant" ? 4 : 16,
-                                    }}>
-                                        {msg.content}
-                                    </div>
-                                    {msg.role === "assistant" && msg.action === "BUILD_RESUME" ? (
-                                        <div style={{ maxWidth: "100%", overflow: "auto" }}>{renderResult(msg)}</div>
-                                    ) : (
-                                        msg.role === "assistant" && renderResult(msg)
-                                    )}
-                                </div>
-                            </div>
-                        ))}
-
-                        {/* Loading */}
-                        {loading && (
-                            <div style={{ display: "flex", gap: 10, marginBottom: 20 }}>
-                                <img src="/favicon.png" alt="AI" style={{ width: 28, height: 28 }} />
-                                <div style={{ padding: "12px 16px", background: "#f4f4f4", borderRadius: 16, display: "flex", alignItems: "center" }}>
-                                    <TypingIndicator />
+                {/* Messages — only turns near the viewport are mounted; older turns load on scroll */}
+                <VirtualMessageList
+                    items={messages}
+                    getKey={(msg) => msg.id}
+                    onReachTop={loadOlder}
+                    style={{ flex: 1, overflowY: "auto", padding: "20px 16px" }}
+                    innerStyle={{ maxWidth: 700, margin: "0 auto" }}
+                    header={loadingOlder && (
+                        <div style={{ textAlign: "center", fontSize: 12, color: "#999", marginBottom: 12 }}>Loading earlier messages…</div>
+                    )}
+                    renderItem={(msg) => (
+                        <div style={{
+                            display: "flex", gap: 10, marginBottom: 20,
+                            flexDirection: msg.role === "user" ? "row-reverse" : "row",
+                        }}>
+                            {msg.role === "assistant" && (
+                                <img src="/favicon.png" alt="AI" style={{ width: 28, height: 28, flexShrink: 0, marginTop: 2 }} />
+                            )}
+                            <div style={{ maxWidth: "85%", overflow: "hidden" }}>
+                                <div style={{
+                                    padding: "10px 14px", borderRadius: 16, fontSize: 14, lineHeight: 1.6,
+                                    whiteSpace: "pre-wrap",
+                                    background: msg.role === "user" ? "#111" : "#f4f4f4",
+                                    color: msg.role === "user" ? "#fff" : "#111",
+                                    borderBottomRightRadius: msg.role === "user" ? 4 : 16,
+                                    borderBottomLeftRadius: msg.role === "assistant" ? 4 : 16,
+                                }}>
+                                    {msg.content}
                                 </div>
+                                {msg.role === "assistant" && msg.action === "BUILD_RESUME" ? (
+                                    <div style={{ maxWidth: "100%", overflow: "auto" }}>{renderResult(msg)}</div>
+                                ) : (
+                                    msg.role === "assistant" && renderResult(msg)
+                                )}
                             </div>
-                        )}
-
-                        {/* Suggestion chips */}
-                        {showChips && (
-                            <div style={{ display: "flex", flexWrap: "wrap", gap: 8, marginTop: 8, justifyContent: "center" }}>
-                                {suggestionChips.map((chip) => (
-                                    <button key={chip} onClick={() => send(chip)} style={{
-                                        padding: "8px 16px", borderRadius: 20, border: "1px solid #ddd",
-                                        background: "#fff", fontSize: 13, cursor: "pointer", color: "#555",
-                                        transition: "all 0.15s",
-                                    }}
-                                        onMouseEnter={(e) => { e.currentTarget.style.background = "#f4f4f4"; e.currentTarget.style.borderColor = "#bbb"; }}
-                                        onMouseLeave={(e) => { e.currentTarget.style.background = "#fff"; e.currentTarget.style.borderColor = "#ddd"; }}
-                                    >{chip}</button>
-                                ))}
+                        </div>
+                    )}
+                >
+                    {/* Loading */}
+                    {loading && (
+                        <div style={{ display: "flex", gap: 10, marginBottom: 20 }}>
+                            <img src="/favicon.png" alt="AI" style={{ width: 28, height: 28 }} />
+                            <div style={{ padding: "12px 16px", background: "#f4f4f4", borderRadius: 16, display: "flex", alignItems: "center" }}>
+                                <TypingIndicator />
                             </div>
-                        )}
+                        </div>
+                    )}
+
+                    {/* Suggestion chips */}
+                    {showChips && (
+                        <div style={{ display: "flex", flexWrap: "wrap", gap: 8, marginTop: 8, justifyContent: "center" }}>
+                            {suggestionChips.map((chip) => (
+                                <button key={chip} onClick={() => send(chip)} style={{
+                                    padding: "8px 16px", borderRadius: 20, border: "1px solid #ddd",
+                                    background: "#fff", fontSize: 13, cursor: "pointer", color: "#555",
+                                    transition: "all 0.15s",
+                                }}
+                                    onMouseEnter={(e) => { e.currentTarget.style.background = "#f4f4f4"; e.currentTarget.style.borderColor = "#bbb"; }}
+                                    onMouseLeave={(e) => { e.currentTarget.style.background = "#fff"; e.currentTarget.style.borderColor = "#ddd"; }}
+                                >{chip}</button>
+                            ))}
+                        </div>
+                    )}
 
-                        <div ref={bottomRef} />
-                    </div>
-                </main>
+                    <div ref={bottomRef} />
+                </VirtualMessageList>
 
                 {/* Input */}
                 <div style={{ padding: "12px 16px 20px", borderTop: "1px solid #f0f0f0" }}>
@@ -23,7 +23,7 @@ interface Profile {
 interface Resume {
     id: string;
     job_title: string;
-    resume_text: string;
+    resume_text?: string; // list responses are summaries; body is fetched on demand
     created_at: string;
 }
 
@@ -41,6 +41,8 @@ export default function ProfilePage() {
     const [profile, setProfile] = useState<Profile | null>(null);
     const [resumes, setResumes] = useState<Resume[]>([]);
     const [applications, setApplications] = useState<Application[]>([]);
+    const [applicationsCursor, setApplicationsCursor] = useState<string | null>(null);
+    const [applicationsTotal, setApplicationsTotal] = useState(0);
     const [plan, setPlan] = useState("free");
     const [editing, setEditing] = useState(false);
     const [saving, setSaving] = useState(false);
@@ -82,13 +84,49 @@ export default function ProfilePage() {
                 setTargetRole(data.profile.target_role || "");
             }
             if (data.resumes) setResumes(data.resumes);
-            if (data.applications) setApplications(data.applications);
+            if (data.applications) {
+                setApplications(data.applications);
+                setApplicationsCursor(data.applicationsCursor || null);
+                setApplicationsTotal(data.applicationsTotal ?? data.applications.length);
+            }
             if (data.usage?.plan) setPlan(data.usage.plan);
         } catch (err) {
             console.error("Load error:", err);
         }
     };
 
+    const loadMoreApplications = async () => {
+        if (!user || !applicationsCursor) return;
+        try {
+            const res = await fetch(`${API_URL}/api/profile/applications?email=${user.email}&before=${encodeURIComponent(applicationsCursor)}`);
+            const data = await res.json();
+            if (data.applications) {
+                setApplications(prev => [...prev, ...data.applications]);
+                setApplicationsCursor(data.applicationsCursor || null);
+            }
+        } catch (err) {
+            console.error("Load error:", err);
+        }
+    };
+
+    // Resume bodies aren't in the profile response; fetch once and keep
+    const withResumeText = async (resume: Resume): Promise<Resume> => {
+        if (resume.resume_text !== undefined || !user) return resume;
+        const res = await fetch(`${API_URL}/api/profile/resumes/${resume.id}?email=${user.email}`);
+        const data = await res.json();
+        const full: Resume = { ...resume, resume_text: data.resume?.resume_text || "" };
+        setResumes(prev => prev.map(r => r.id === full.id ? full : r));
+        return full;
+    };
+
+    const viewResume = async (resume: Resume) => {
+        try {
+            setPreviewResume(await withResumeText(resume));
+        } catch (err) {
+            console.error("Load error:", err);
+        }
+    };
+
     const handleSave = async () => {
         if (!user) return;
         setSaving(true);
@@ -116,17 +154,19 @@ export default function ProfilePage() {
         setSaving(false);
     };
 
-    const downloadResume = (resume: Resume, format: "txt" | "html") => {
+    const downloadResume = async (summary: Resume, format: "txt" | "html") => {
+        const resume = await withResumeText(summary);
+        const text = resume.resume_text || "";
         let content: string;
         let mimeType: string;
         let ext: string;
 
         if (format === "html") {
-            content = `<!DOCTYPE html><html><head><meta charset="utf-8"><title>${resume.job_title} Resume</title><style>body{font-family:Georgia,serif;max-width:700px;margin:40px auto;padding:20px;line-height:1.6;color:#222}h1,h2{border-bottom:1px solid #ccc;padding-bottom:4px}</style></head><body><pre style="white-space:pre-wrap;font-family:inherit">${resume.resume_text}</pre></body></html>`;
+            content = `<!DOCTYPE html><html><head><meta charset="utf-8"><title>${resume.job_title} Resume</title><style>body{font-family:Georgia,serif;max-width:700px;margin:40px auto;padding:20px;line-height:1.6;color:#222}h1,h2{border-bottom:1px solid #ccc;padding-bottom:4px}</style></head><body><pre style="white-space:pre-wrap;font-family:inherit">${text}</pre></body></html>`;
             mimeType = "text/html";
             ext = "html";
         } else {
-            content = resume.resume_text;
+            content = text;
             mimeType = "text/plain";
             ext = "txt";
         }
@@ -199,7 +239,7 @@ export default function ProfilePage() {
                             color: tab === t ? "#111" : "#888", background: "none", border: "none",
                             borderBottom: tab === t ? "2px solid #111" : "2px solid transparent",
                             cursor: "pointer", textTransform: "capitalize",
-                        }}>{t} {t === "resumes" ? `(${resumes.length})` : t === "applications" ? `(${applications.length})` : ""}</button>
+                        }}>{t} {t === "resumes" ? `(${resumes.length})` : t === "applications" ? `(${applicationsTotal})` : ""}</button>
                     ))}
                 </div>
 
@@ -277,7 +317,7 @@ export default function ProfilePage() {
                                             <div style={{ fontSize: 12, color: "#888" }}>{new Date(r.created_at).toLocaleDateString("en-IN", { day: "numeric", month: "short", year: "numeric" })}</div>
                                         </div>
                                         <div style={{ display: "flex", gap: 6 }}>
-                                            <button onClick={() => setPreviewResume(r)} style={{ padding: "6px 12px", borderRadius: 6, fontSize: 12, border: "1px solid #ddd", background: "#fff", cursor: "pointer" }}>View</button>
+                                            <button onClick={() => viewResume(r)} style={{ padding: "6px 12px", borderRadius: 6, fontSize: 12, border: "1px solid #ddd", background: "#fff", cursor: "pointer" }}>View</button>
                                             <button onClick={() => downloadResume(r, "txt")} style={{ padding: "6px 12px", borderRadius: 6, fontSize: 12, border: "none", background: "#111", color: "#fff", cursor: "pointer" }}>Download</button>
                                         </div>
                                     </div>
@@ -293,7 +333,7 @@ export default function ProfilePage() {
                                         <h3 style={{ margin: 0, fontSize: 16, fontWeight: 700 }}>{previewResume.job_title}</h3>
                                         <button onClick={() => setPreviewResume(null)} style={{ padding: "6px 12px", borderRadius: 6, fontSize: 12, border: "1px solid #ddd", background: "#fff", cursor: "pointer" }}>✕</button>
                                     </div>
-                                    <ResumePreview resumeText={previewResume.resume_text} />
+                                    <ResumePreview resumeText={previewResume.resume_text || ""} />
                                 </div>
                             </div>
                         )}
@@ -335,6 +375,11 @@ export default function ProfilePage() {
                                 </tbody>
                             </table>
                         )}
+                        {applicationsCursor && (
+                            <div style={{ padding: 12, textAlign: "center", borderTop: "1px solid #f5f5f5" }}>
+                                <button onClick={loadMoreApplications} style={{ padding: "6px 16px", borderRadius: 8, fontSize: 13, border: "1px solid #ddd", background: "#fff", cursor: "pointer" }}>Load more</button>
+                            </div>
+                        )}
                     </div>
                 )}
             </div>
@@ -0,0 +1,126 @@
+"use client";
+
+import { useEffect, useLayoutEffect, useRef, useState } from "react";
+
+type VirtualMessageListProps<T> = {
+    items: T[];
+    getKey: (item: T) => string;
+    renderItem: (item: T) => React.ReactNode;
+    onReachTop?: () => void;       // load older turns
+    estimatedHeight?: number;      // used until an item has been measured
+    overscan?: number;             // px rendered above and below the viewport
+    style?: React.CSSProperties;   // scroll container
+    innerStyle?: React.CSSProperties;
+    header?: React.ReactNode;      // rendered above the list (e.g. "loading earlier messages")
+    children?: React.ReactNode;    // rendered after the list (typing indicator, chips, scroll anchor)
+};
+
+// Renders only the messages near the viewport. Heights are measured as items
+// mount, and scroll position is kept steady when older turns are prepended.
+export function VirtualMessageList<T>({
+    items, getKey, renderItem, onReachTop,
+    estimatedHeight = 120, overscan = 800, style, innerStyle, header, children,
+}: VirtualMessageListProps<T>) {
+    const containerRef = useRef<HTMLElement>(null);
+    const heights = useRef(new Map<string, number>());
+    const layout = useRef<{ keys: string[]; offsets: number[] }>({ keys: [], offsets: [0] });
+    const lastScrollTop = useRef(0);
+    const firstKey = useRef<string | null>(null);
+    const observer = useRef<ResizeObserver | null>(null);
+    const [viewport, setViewport] = useState({ top: 0, height: 800 });
+    const [, setMeasured] = useState(0);
+
+    const keys = items.map(getKey);
+    const offsets = [0];
+    for (let i = 0; i < keys.length; i++) {
+        offsets.push(offsets[i] + (heights.current.get(keys[i]) ?? estimatedHeight));
+    }
+    layout.current = { keys, offsets };
+    const total = offsets[keys.length];
+
+    let start = 0;
+    while (start < keys.length && offsets[start + 1] < viewport.top - overscan) start++;
+    let end = start;
+    while (end < keys.length && offsets[end] < viewport.top + viewport.height + overscan) end++;
+
+    // Measure rendered items; if one above the viewport changes size, shift scrollTop so content doesn't jump
+    const getObserver = () => {
+        if (!observer.current) {
+            observer.current = new ResizeObserver((entries) => {
+                const el = containerRef.current;
+                let changed = false;
+                for (const entry of entries) {
+                    const target = entry.target as HTMLElement;
+                    if (!target.isConnected) {
+                        observer.current?.unobserve(target);
+                        continue;
+                    }
+                    const key = target.dataset.key!;
+                    const height = target.offsetHeight;
+                    const previous = heights.current.get(key) ?? estimatedHeight;
+                    if (height === previous) continue;
+                    heights.current.set(key, height);
+                    changed = true;
+
+                    const index = layout.current.keys.indexOf(key);
+                    if (el && index >= 0 && layout.current.offsets[index + 1] <= el.scrollTop) {
+                        el.scrollTop += height - previous;
+                    }
+                }
+                if (changed) setMeasured((n) => n + 1);
+            });
+        }
+        return observer.current;
+    };
+
+    useEffect(() => () => observer.current?.disconnect(), []);
+
+    useEffect(() => {
+        const el = containerRef.current;
+        if (!el) return;
+        const resize = () => setViewport({ top: el.scrollTop, height: el.clientHeight });
+        resize();
+        window.addEventListener("resize", resize);
+        return () => window.removeEventListener("resize", resize);
+    }, []);
+
+    // Older turns were prepended: keep the previously-first message where it was
+    useLayoutEffect(() => {
+        const el = containerRef.current;
+        const previous = firstKey.current;
+        firstKey.current = keys[0] ?? null;
+        if (!el || !previous || previous === keys[0]) return;
+        const index = keys.indexOf(previous);
+        if (index > 0) el.scrollTop += offsets[index];
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [keys[0]]);
+
+    const measure = (el: HTMLDivElement | null) => {
+        if (el) getObserver().observe(el);
+    };
+
+    const handleScroll = () => {
+        const el = containerRef.current;
+        if (!el) return;
+        const scrollingUp = el.scrollTop < lastScrollTop.current;
+        lastScrollTop.current = el.scrollTop;
+        setViewport({ top: el.scrollTop, height: el.clientHeight });
+        if (scrollingUp && el.scrollTop < 300) onReachTop?.();
+    };
+
+    return (
+        <main ref={containerRef} onScroll={handleScroll} style={{ ...style, overflowAnchor: "none" }}>
+            <div style={innerStyle}>
+                {header}
+                <div style={{ height: offsets[start] }} />
+                {items.slice(start, end).map((item, i) => (
+                    <div key={keys[start + i]} data-key={keys[start + i]} ref={measure} style={{ display: "flow-root" }}>
+                        {renderItem(item)}
+                    </div>
+                ))}
+                <div style={{ height: total - offsets[end] }} />
+                {children}
+            </div>
+        </main>
+    );
+}